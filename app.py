@@ -1,6 +1,11 @@
 import os
+import sys
 import shutil
-from datetime import datetime, timedelta
+import tempfile
+import threading
+import traceback
+from contextlib import suppress
+from datetime import datetime, timedelta, time
 try:
     from dateutil.tz import tzlocal, gettz
 except ImportError:
@@ -15,21 +20,50 @@ except ImportError:
         tzlocal = lambda: timezone.utc
         gettz = lambda name: timezone.utc if name else timezone.utc
 
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file, session, jsonify, abort
+from flask import Flask, render_template, request, redirect, url_for, flash, send_file, session, jsonify, abort, g, after_this_request, has_request_context
 from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Index, CheckConstraint, event, func
+from sqlalchemy import Index, CheckConstraint, event, func, update, delete, text
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.pool import NullPool
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError, OperationalError, IntegrityError
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from io import BytesIO
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 import uuid
 import functools
+from time import monotonic, time_ns
+
+# stderr 로그를 줄 단위로 즉시 출력 (블록 버퍼링 환경에서 서버리스 종료 시 오류 로그 유실 방지)
+try:
+    sys.stderr.reconfigure(line_buffering=True)
+except (AttributeError, ValueError):
+    pass
+
 # Defer pandas import to avoid heavy loading at module import time
+_pandas_module = None
+
+
+def get_pandas():
+    """pandas 지연 로딩 (최초 호출 시 한 번만 import 후 모듈 캐시)"""
+    global _pandas_module
+    if _pandas_module is None:
+        import pandas
+        _pandas_module = pandas
+    return _pandas_module
+
+
+def _warm_pandas_import():
+    try:
+        get_pandas()
+    except Exception as e:
+        try:
+            sys.stderr.write(f"Warning: pandas warm-up import failed: {e}\n")
+        except Exception:
+            pass
 
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -137,6 +171,9 @@ else:
             os.makedirs(STATIC_DIR, exist_ok=True)
     except (OSError, PermissionError):
         pass
+    # 장기 실행 서버에서는 pandas를 백그라운드로 미리 import하여 첫 엑셀 요청의 지연을 없앰
+    # (서버리스는 콜드 스타트 비용 때문에 요청 시 지연 로딩 유지)
+    threading.Thread(target=_warm_pandas_import, name='pandas-warmup', daemon=True).start()
 
 
 
@@ -235,8 +272,18 @@ def create_app():
             except Exception:
                 pass
     else:
-        # Local development
+        # Local development / Docker (장기 실행 프로세스 - 커넥션 풀 재사용)
         app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DB_PATH}'
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': 20,
+            'max_overflow': 10,
+            'pool_pre_ping': True,
+            'pool_recycle': 1800,
+            'connect_args': {
+                'check_same_thread': False,
+                'timeout': 20,
+            },
+        }
     
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     return app
@@ -318,7 +365,6 @@ try:
     except Exception:
         print("✓ Flask app created successfully")
 except Exception as e:
-    import traceback
     error_msg = f"CRITICAL: App creation failed: {e}\n{traceback.format_exc()}"
     try:
         import sys
@@ -382,6 +428,35 @@ def _ensure_aware(dt):
         return dt
 
 
+def _to_kst(dt):
+    # naive는 이미 KST로 간주, KST 자체인 경우 변환 생략
+    if dt.tzinfo is KST:
+        return dt
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=KST)
+    return dt.astimezone(KST)
+
+
+def fmt_kst_display(dt) -> str:
+    """화면 표시용 KST 문자열 (YYYY-MM-DD HH:MM), 값이 없으면 ''"""
+    if not dt:
+        return ''
+    try:
+        return _to_kst(dt).isoformat(' ', 'minutes')[:16]
+    except Exception:
+        return ''
+
+
+def fmt_kst_input(dt) -> str:
+    """datetime-local 입력값용 KST 문자열 (YYYY-MM-DDTHH:MM), 값이 없으면 ''"""
+    if not dt:
+        return ''
+    try:
+        return _to_kst(dt).isoformat('T', 'minutes')[:16]
+    except Exception:
+        return ''
+
+
 def ensure_logo():
     """로고 파일이 없으면 원본에서 복사 - 안전하게 처리"""
     try:
@@ -623,6 +698,14 @@ def define_models():
                 Index('idx_ins_app_start', 'start_at'),
                 Index('idx_ins_app_car_plate', 'car_plate'),
                 Index('idx_ins_app_vin', 'vin'),
+                # 파트너그룹별 기간 조회용 복합 인덱스
+                Index('idx_ins_app_pg_start', 'partner_group_id', 'start_at'),
+                Index('idx_ins_app_pg_created', 'partner_group_id', 'created_at'),
+                Index('idx_ins_app_pg_approved', 'partner_group_id', 'approved_at'),
+                # 미승인 건 조회/일괄 승인용 부분 인덱스 (PostgreSQL/SQLite)
+                Index('idx_ins_app_pending', 'created_at',
+                      postgresql_where=text('approved_at IS NULL'),
+                      sqlite_where=text('approved_at IS NULL')),
                 CheckConstraint("status IN ('신청','조합승인','가입','종료')", name='ck_ins_app_status'),
             )
 
@@ -630,8 +713,10 @@ def define_models():
             partner_group = db.relationship('PartnerGroup', backref='insurance_applications')
             created_by_member = db.relationship('Member', backref='applications')
 
-            def recompute_status(self) -> None:
+            def recompute_status(self) -> bool:
+                """상태/가입시간/포인트 차감을 재계산하고, 실제로 변경된 값이 있으면 True를 반환"""
                 now = datetime.now(KST)
+                changed = False
                 approved_at_local = _ensure_aware(self.approved_at)
                 start_at_local = _ensure_aware(self.start_at)
                 end_at_local = _ensure_aware(self.end_at)
@@ -644,17 +729,22 @@ def define_models():
                         start_at_local = activation_time
                         self.end_at = activation_time + timedelta(days=30)
                         end_at_local = _ensure_aware(self.end_at)
+                        changed = True
 
                 if start_at_local is not None:
                     if end_at_local is None:
                         self.end_at = start_at_local + timedelta(days=30)
                         end_at_local = _ensure_aware(self.end_at)
+                        changed = True
 
                     if end_at_local and now >= end_at_local:
-                        self.status = '종료'
+                        if self.status != '종료':
+                            self.status = '종료'
+                            changed = True
                     else:
                         if self.status != '가입':
                             self.status = '가입'
+                            changed = True
                         if not self.point_deducted and self.created_by_member is not None:
                             member = self.created_by_member
                             if member:
@@ -685,9 +775,13 @@ def define_models():
                                                 pass
                                     
                                     self.point_deducted = True
+                                    changed = True
                 else:
-                    if end_at_local and now >= end_at_local:
+                    if end_at_local and now >= end_at_local and self.status != '종료':
                         self.status = '종료'
+                        changed = True
+
+                return changed
 
         class DepositHistory(ModelBase):
             __tablename__ = 'deposit_history'
@@ -704,6 +798,11 @@ def define_models():
             member = db.relationship('Member', backref='deposit_histories')
             partner_group = db.relationship('PartnerGroup', backref='deposit_histories')
 
+            __table_args__ = (
+                Index('idx_deposit_history_partner_group', 'partner_group_id'),
+                Index('idx_deposit_history_member', 'member_id'),
+            )
+
         class DepositRequest(ModelBase):
             __tablename__ = 'deposit_request'
 
@@ -741,6 +840,11 @@ def define_models():
             member = db.relationship('Member', backref='point_adjustments')
             partner_group = db.relationship('PartnerGroup', backref='point_adjustments')
 
+            __table_args__ = (
+                Index('idx_point_adjustment_partner_group', 'partner_group_id'),
+                Index('idx_point_adjustment_member', 'member_id'),
+            )
+
         class VirtualAccount(ModelBase):
             __tablename__ = 'virtual_account'
 
@@ -757,6 +861,11 @@ def define_models():
 
             member = db.relationship('Member', backref='virtual_accounts')
             partner_group = db.relationship('PartnerGroup', backref='virtual_accounts')
+
+            __table_args__ = (
+                Index('idx_virtual_account_partner_group', 'partner_group_id'),
+                Index('idx_virtual_account_member', 'member_id'),
+            )
         
         # Make models available globally
         globals()['PartnerGroup'] = PartnerGroup
@@ -805,8 +914,8 @@ else:
         status = None
         partner_group_id = None
         point_deducted = None
-        def recompute_status(self) -> None:
-            pass
+        def recompute_status(self) -> bool:
+            return False
 
     class DepositHistory:
         id = None
@@ -1096,6 +1205,14 @@ def init_db_and_assets():
                         print("Added point_deducted column to insurance_application table (PostgreSQL)")
                     except Exception as e:
                         print(f"Warning: Failed to add point_deducted: {e}")
+        
+        # 인덱스 보정: create_all()은 기존 테이블에 새 인덱스를 추가하지 않으므로 누락된 인덱스 생성
+        if not is_serverless:
+            for index in InsuranceApplication.__table__.indexes:
+                try:
+                    index.create(bind=db.engine, checkfirst=True)
+                except Exception as e:
+                    print(f"Warning: Failed to create index {index.name}: {e}")
     except Exception as e:
         print(f"Warning: Schema migration failed: {e}")
         import traceback
@@ -1582,6 +1699,24 @@ if app is not None:
             except Exception:
                 pass
     
+    @app.before_request
+    def _load_partner_group():
+        """파트너그룹 관리자 요청 시 소속 파트너그룹을 요청당 한 번만 조회하여 g에 보관"""
+        g.partner_group = None
+        if session.get('user_type') != 'partner_admin':
+            return
+        if not (request.endpoint or '').startswith('partner_admin'):
+            return
+        partner_group_id = session.get('partner_group_id')
+        if not partner_group_id or db is None:
+            return
+        try:
+            ensure_initialized()
+            # 기본키 조회 - identity map에 있으면 SQL 없이 반환
+            g.partner_group = db.session.get(PartnerGroup, partner_group_id)
+        except Exception as e:
+            app.logger.warning("Failed to load partner group in before_request: %s", e)
+    
     @app.after_request
     def _handle_db_transaction_errors(response):
         """Handle PostgreSQL transaction errors after each request"""
@@ -3044,6 +3179,7 @@ def terms_policy_download():
         return redirect(url_for('terms'))
 
 
+@functools.lru_cache(maxsize=256)
 def parse_date(value: str):
     if not value:
         return None
@@ -3069,6 +3205,82 @@ def parse_datetime(value: str):
         return None
 
 
+# 날짜 검색 조건의 하루 시작/끝 시각
+_MIN_TIME = time(0, 0, 0)
+_MAX_TIME = time(23, 59, 59, 999999)
+
+
+def day_range(d_start, d_end):
+    """검색 시작일/종료일(date)을 KST 기준 (시작일 00:00:00, 종료일 23:59:59.999999)로 변환 (없으면 None)"""
+    return (
+        datetime.combine(d_start, _MIN_TIME, tzinfo=KST) if d_start else None,
+        datetime.combine(d_end, _MAX_TIME, tzinfo=KST) if d_end else None,
+    )
+
+
+def sql_datetime_str(column, fmt: str = '%Y-%m-%d %H:%M:%S'):
+    """날짜/시간 컬럼을 DB에서 문자열로 포맷하는 SQL 표현식 (컬럼명 라벨 유지)
+    
+    fmt는 '%Y-%m-%d %H:%M:%S' 또는 '%Y-%m-%d'만 사용한다.
+    지원하지 않는 DB에서는 원본 컬럼을 그대로 반환한다.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        expr = func.strftime(fmt, column)
+    elif dialect == 'postgresql':
+        expr = func.to_char(column, fmt.replace('%Y', 'YYYY').replace('%m', 'MM').replace('%d', 'DD')
+                            .replace('%H', 'HH24').replace('%M', 'MI').replace('%S', 'SS'))
+    elif dialect in ('mysql', 'mariadb'):
+        expr = func.date_format(column, fmt.replace('%M', '%i').replace('%S', '%s'))
+    else:
+        return column
+    return expr.label(column.key)
+
+
+def _xlsx_workbook(sheet_name: str, headers, rows) -> Workbook:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    ws.append(list(headers))
+    for row in rows:
+        ws.append(row)
+    return wb
+
+
+def build_xlsx(sheet_name: str, headers, rows) -> BytesIO:
+    """행 단위로 기록하는 write-only 워크북으로 엑셀 파일을 생성 (DataFrame 미사용)"""
+    buffer = BytesIO()
+    _xlsx_workbook(sheet_name, headers, rows).save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def send_xlsx(sheet_name: str, headers, rows, download_name: str):
+    """엑셀 파일을 메모리 대신 임시 파일에 기록해 전송 (응답 후 임시 파일 삭제)"""
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        _xlsx_workbook(sheet_name, headers, rows).save(path)
+    except Exception:
+        os.unlink(path)
+        raise
+    
+    @after_this_request
+    def _remove_xlsx_tempfile(response):
+        # send_file이 이미 파일을 열어두었으므로 경로만 삭제해도 전송에는 영향 없음
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        return response
+    
+    return send_file(
+        path,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
 @app.route('/insurance', methods=['GET', 'POST'])
 @login_required
 def insurance():
@@ -3275,9 +3487,7 @@ def insurance():
     # 상태 재계산
     changed = False
     for r in rows:
-        old_status = r.status
-        r.recompute_status()
-        if r.status != old_status:
+        if r.recompute_status():
             changed = True
     if changed:
         safe_commit()  # Don't show error if status update fails, just log it
@@ -3354,7 +3564,7 @@ def insurance():
 @login_required
 def insurance_template_download():
     # Import pandas only when needed
-    import pandas as pd
+    pd = get_pandas()
     
     # Create Excel template in-memory
     df = pd.DataFrame([
@@ -3391,7 +3601,7 @@ def insurance_upload():
         return redirect(url_for('insurance'))
     try:
         # Import pandas only when needed
-        import pandas as pd
+        pd = get_pandas()
         df = pd.read_excel(file)
         required_cols = {
             '가입희망일자(YYYY-MM-DD)',
@@ -3895,7 +4105,7 @@ def admin_insurance_overview():
             return redirect(url_for('admin_insurance_overview'))
         
         try:
-            app = db.session.query(InsuranceApplication).filter_by(id=int(application_id)).first()
+            app = db.session.get(InsuranceApplication, int(application_id))
             if not app:
                 flash('보험 신청을 찾을 수 없습니다.', 'danger')
                 return redirect(url_for('admin_insurance_overview'))
@@ -3993,10 +4203,11 @@ def admin_insurance_overview():
     # 보험신청 데이터 조회
     q = db.session.query(InsuranceApplication)
     
-    if start_date:
-        q = q.filter(InsuranceApplication.created_at >= datetime.combine(start_date, datetime.min.time(), tzinfo=KST))
-    if end_date:
-        q = q.filter(InsuranceApplication.created_at <= datetime.combine(end_date, datetime.max.time(), tzinfo=KST))
+    start_dt, end_dt = day_range(start_date, end_date)
+    if start_dt:
+        q = q.filter(InsuranceApplication.created_at >= start_dt)
+    if end_dt:
+        q = q.filter(InsuranceApplication.created_at <= end_dt)
     if partner_group_id:
         try:
             q = q.filter(InsuranceApplication.partner_group_id == int(partner_group_id))
@@ -4011,10 +4222,13 @@ def admin_insurance_overview():
     
     applications = q.order_by(InsuranceApplication.created_at.desc()).all()
     
-    # 상태 재계산
+    # 상태 재계산 (변경된 행이 있을 때만 커밋)
+    changed = False
     for app in applications:
-        app.recompute_status()
-    safe_commit()
+        if app.recompute_status():
+            changed = True
+    if changed:
+        safe_commit()
     
     return render_template('admin/insurance_overview.html',
                          applications=applications,
@@ -4054,8 +4268,6 @@ def admin_insurance_overview_members():
 @admin_required
 def admin_insurance_overview_export():
     ensure_initialized()
-    import pandas as pd
-    from io import BytesIO
     
     # 검색 조건 (동일한 필터 적용)
     start_date = parse_date(request.args.get('start_date', ''))
@@ -4071,10 +4283,11 @@ def admin_insurance_overview_export():
     # 보험신청 데이터 조회 (동일한 필터)
     q = db.session.query(InsuranceApplication)
     
-    if start_date:
-        q = q.filter(InsuranceApplication.created_at >= datetime.combine(start_date, datetime.min.time(), tzinfo=KST))
-    if end_date:
-        q = q.filter(InsuranceApplication.created_at <= datetime.combine(end_date, datetime.max.time(), tzinfo=KST))
+    start_dt, end_dt = day_range(start_date, end_date)
+    if start_dt:
+        q = q.filter(InsuranceApplication.created_at >= start_dt)
+    if end_dt:
+        q = q.filter(InsuranceApplication.created_at <= end_dt)
     if partner_group_id:
         try:
             q = q.filter(InsuranceApplication.partner_group_id == int(partner_group_id))
@@ -4087,53 +4300,44 @@ def admin_insurance_overview_export():
     elif status_filter == '미가입':
         q = q.filter(InsuranceApplication.start_at.is_(None))
     
-    applications = q.order_by(InsuranceApplication.created_at.desc()).all()
-    
-    # 엑셀 데이터 생성
-    data = []
-    for app in applications:
-        partner_group_name = ''
-        if app.partner_group_id:
-            try:
-                pg = db.session.query(PartnerGroup).filter_by(id=app.partner_group_id).first()
-                if pg:
-                    partner_group_name = pg.name
-            except Exception:
-                pass
-        
-        data.append({
-            '순': len(data) + 1,
-            '파트너그룹(상호)': partner_group_name,
-            '상사명': app.created_by_member.company_name if app.created_by_member else '',
-            '신청시간': app.created_at.strftime('%Y-%m-%d %H:%M:%S') if app.created_at else '',
-            '가입희망일자': app.desired_start_date.strftime('%Y-%m-%d') if app.desired_start_date else '',
-            '가입시간': app.start_at.strftime('%Y-%m-%d %H:%M:%S') if app.start_at else '',
-            '종료시간': app.end_at.strftime('%Y-%m-%d %H:%M:%S') if app.end_at else '',
-            '조합승인시간': app.approved_at.strftime('%Y-%m-%d %H:%M:%S') if app.approved_at else '',
-            '피보험자코드': app.insured_code or '',
-            '계약자코드': app.contractor_code or '',
-            '한글차량번호': app.car_plate or '',
-            '차대번호': app.vin or '',
-            '차량명': app.car_name or '',
-            '차량등록일자': app.car_registered_at.strftime('%Y-%m-%d') if app.car_registered_at else '',
-            '보험료': app.premium or 0,
-            '보험증권': '있음' if (app.insurance_policy_path or app.insurance_policy_url) else '없음',
-            '비고': app.memo or '',
-        })
+    # 500행 단위로 스트리밍 (전체 결과를 한 번에 메모리에 올리지 않음)
+    applications = (
+        q.options(
+            joinedload(InsuranceApplication.created_by_member),
+            joinedload(InsuranceApplication.partner_group),
+        )
+        .order_by(InsuranceApplication.created_at.desc())
+        .yield_per(500)
+    )
     
-    df = pd.DataFrame(data)
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='전체책임보험현황')
-    buffer.seek(0)
+    headers = ['순', '파트너그룹(상호)', '상사명', '신청시간', '가입희망일자', '가입시간', '종료시간',
+               '조합승인시간', '피보험자코드', '계약자코드', '한글차량번호', '차대번호', '차량명',
+               '차량등록일자', '보험료', '보험증권', '비고']
+    rows = (
+        (
+            idx,
+            app.partner_group.name if app.partner_group else '',
+            app.created_by_member.company_name if app.created_by_member else '',
+            app.created_at.strftime('%Y-%m-%d %H:%M:%S') if app.created_at else '',
+            app.desired_start_date.strftime('%Y-%m-%d') if app.desired_start_date else '',
+            app.start_at.strftime('%Y-%m-%d %H:%M:%S') if app.start_at else '',
+            app.end_at.strftime('%Y-%m-%d %H:%M:%S') if app.end_at else '',
+            app.approved_at.strftime('%Y-%m-%d %H:%M:%S') if app.approved_at else '',
+            app.insured_code or '',
+            app.contractor_code or '',
+            app.car_plate or '',
+            app.vin or '',
+            app.car_name or '',
+            app.car_registered_at.strftime('%Y-%m-%d') if app.car_registered_at else '',
+            app.premium or 0,
+            '있음' if (app.insurance_policy_path or app.insurance_policy_url) else '없음',
+            app.memo or '',
+        )
+        for idx, app in enumerate(applications, start=1)
+    )
     
     filename = f'전체책임보험현황_{datetime.now(KST).strftime("%Y%m%d_%H%M%S")}.xlsx'
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name=filename,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-    )
+    return send_xlsx('전체책임보험현황', headers, rows, filename)
 
 # 전체정산페이지 (요구사항의 전체정산페이지)
 @app.route('/admin/settlement-overview')
@@ -4223,7 +4427,7 @@ def admin_settlement_overview():
 @admin_required
 def admin_settlement_overview_export():
     ensure_initialized()
-    import pandas as pd
+    pd = get_pandas()
     from io import BytesIO
     
     year = int(request.args.get('year', datetime.now().year))
@@ -4566,7 +4770,7 @@ def partner_insurance():
                 if creation_allowed:
                     try:
                         # 파트너그룹 정보 가져오기
-                        partner_group = db.session.query(PartnerGroup).filter_by(id=partner_group_id).first()
+                        partner_group = db.session.get(PartnerGroup, partner_group_id)
                         partner_group_name = partner_group.name if partner_group else ''
                         
                         # 피보험자코드 설정
@@ -4650,14 +4854,14 @@ def partner_insurance():
                 file = request.files['excel_file']
                 if file and file.filename:
                     try:
-                        import pandas as pd
+                        pd = get_pandas()
                         from io import BytesIO
                         
                         # 엑셀 파일 읽기
                         df = pd.read_excel(file)
                         
                         # 파트너그룹 정보
-                        partner_group = db.session.query(PartnerGroup).filter_by(id=partner_group_id).first()
+                        partner_group = db.session.get(PartnerGroup, partner_group_id)
                         partner_group_name = partner_group.name if partner_group else ''
                         
                         success_count = 0
@@ -4858,7 +5062,7 @@ def partner_insurance():
         edit_id = request.args.get('edit_id')
         
         # 파트너그룹 정보 가져오기
-        partner_group = db.session.query(PartnerGroup).filter_by(id=partner_group_id).first()
+        partner_group = db.session.get(PartnerGroup, partner_group_id)
         partner_group_name = partner_group.name if partner_group else ''
         
         q = db.session.query(InsuranceApplication).filter_by(partner_group_id=partner_group_id)
@@ -4868,11 +5072,12 @@ def partner_insurance():
             q = q.filter_by(created_by_member_id=current_user.id)
         
         # 검색 조건: 가입일자 기준 (start_at이 있으면 start_at, 없으면 desired_start_date)
+        start_dt, end_dt = day_range(start_date, end_date)
         if start_date:
             q = q.filter(
                 db.or_(
                     db.and_(InsuranceApplication.start_at.is_not(None), 
-                           InsuranceApplication.start_at >= datetime.combine(start_date, datetime.min.time(), tzinfo=KST)),
+                           InsuranceApplication.start_at >= start_dt),
                     db.and_(InsuranceApplication.start_at.is_(None),
                            InsuranceApplication.desired_start_date >= start_date)
                 )
@@ -4881,7 +5086,7 @@ def partner_insurance():
             q = q.filter(
                 db.or_(
                     db.and_(InsuranceApplication.start_at.is_not(None),
-                           InsuranceApplication.start_at <= datetime.combine(end_date, datetime.max.time(), tzinfo=KST)),
+                           InsuranceApplication.start_at <= end_dt),
                     db.and_(InsuranceApplication.start_at.is_(None),
                            InsuranceApplication.desired_start_date <= end_date)
                 )
@@ -4889,10 +5094,13 @@ def partner_insurance():
         
         applications = q.order_by(InsuranceApplication.created_at.desc()).all()
         
-        # 상태 재계산
+        # 상태 재계산 (변경된 행이 있을 때만 커밋)
+        changed = False
         for app in applications:
-            app.recompute_status()
-        safe_commit()
+            if app.recompute_status():
+                changed = True
+        if changed:
+            safe_commit()
         
         show_point_modal = session.pop('point_top_up_required', False)
 
@@ -5078,7 +5286,7 @@ def api_get_car_info():
 def partner_insurance_excel_template():
     try:
         ensure_initialized()
-        import pandas as pd
+        pd = get_pandas()
         from io import BytesIO
         
         # 엑셀 양식 생성
@@ -6126,7 +6334,7 @@ def partner_admin_member_approval():
                     flash('엑셀 파일을 선택하세요.', 'warning')
                 else:
                     try:
-                        import pandas as pd
+                        pd = get_pandas()
                         df = pd.read_excel(file)
                         created = 0
                         skipped = 0
@@ -6297,7 +6505,8 @@ def partner_admin_member_approval():
                                 settlement_method = '포인트'
                             member.settlement_method = settlement_method
                             
-                            # 사업자등록증 파일 업로드 처리
+                            # 사업자등록증 파일 업로드 처리 (기존 파일은 커밋 성공 후 삭제)
+                            replaced_cert_filepath = None
                             if 'registration_cert' in request.files:
                                 try:
                                     file = request.files['registration_cert']
@@ -6308,24 +6517,19 @@ def partner_admin_member_approval():
                                             # 업로드 디렉토리 확인 및 생성
                                             os.makedirs(UPLOAD_DIR, exist_ok=True)
                                             
-                                            # 기존 파일이 있으면 삭제 (선택사항)
-                                            if member.registration_cert_path:
-                                                old_filepath = os.path.join(UPLOAD_DIR, member.registration_cert_path.split('/')[-1])
-                                                try:
-                                                    if os.path.exists(old_filepath):
-                                                        os.remove(old_filepath)
-                                                except Exception:
-                                                    pass  # 기존 파일 삭제 실패해도 계속 진행
-                                            
                                             # 새 파일 저장
-                                            timestamp = datetime.now(KST).strftime('%Y%m%d_%H%M%S')
+                                            timestamp = time_ns()  # 파일명 고유값 (초 단위 시각 문자열은 기존 파일명과 겹칠 수 있음)
                                             business_number = member.business_number or 'unknown'
                                             filename = f"{business_number}_{timestamp}{file_ext}"
                                             filepath = os.path.join(UPLOAD_DIR, filename)
-                                            file.save(filepath)
                                             
-                                            # 파일이 실제로 저장되었는지 확인
-                                            if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+                                            # 임시 파일에 기록 후 교체 (저장 실패 시 기존 파일 유지)
+                                            # save_cert_upload가 True를 반환하면 새 파일이 이미 디스크에 있으므로 그때만 기존 파일을 삭제 대상으로 지정
+                                            if save_cert_upload(file, filepath):
+                                                if member.registration_cert_path:
+                                                    replaced_cert_filepath = os.path.join(UPLOAD_DIR, member.registration_cert_path.split('/')[-1])
+                                                    if replaced_cert_filepath == filepath:
+                                                        replaced_cert_filepath = None
                                                 member.registration_cert_path = os.path.join('uploads', filename)
                                                 print(f"Registration cert updated successfully: {member.registration_cert_path}")
                                             else:
@@ -6352,6 +6556,8 @@ def partner_admin_member_approval():
                             commit_success = safe_commit()
                             
                             if commit_success:
+                                if replaced_cert_filepath:
+                                    _remove_file_quietly(replaced_cert_filepath)
                                 # 커밋 성공 후 검증
                                 try:
                                     import sys
@@ -6413,7 +6619,7 @@ def partner_admin_member_approval():
 def partner_admin_member_excel_template():
     try:
         ensure_initialized()
-        import pandas as pd
+        pd = get_pandas()
         from io import BytesIO
         
         # 엑셀 양식 생성
@@ -6455,6 +6661,60 @@ def partner_admin_member_excel_template():
         return redirect(url_for('partner_admin_member_approval'))
 
 # 파트너그룹 책임보험승인 페이지
+# POST 처리 후 리다이렉트 시 유지할 검색 조건 파라미터
+_APPROVAL_FILTER_ARGS = ('req_start', 'req_end', 'approved', 'appr_start', 'appr_end', 'edit_id')
+
+# 책임보험승인 POST 액션별 (성공, 실패) 메시지
+_APPROVAL_ACTION_MESSAGES = {
+    'bulk_approve': ('{count}건이 일괄 승인되었습니다.', '일괄 승인 처리 중 오류가 발생했습니다.'),
+    'approve': ('승인되었습니다.', '승인 처리 중 오류가 발생했습니다.'),
+    'delete': ('삭제되었습니다.', '삭제 처리 중 오류가 발생했습니다.'),
+    'save': ('저장되었습니다.', '저장 처리 중 오류가 발생했습니다.'),
+}
+
+
+def _insurance_approval_query(partner_group_id, args, *columns):
+    """파트너그룹 책임보험승인 목록/엑셀 공용 조회 쿼리 (검색 조건 적용, 신청시간 역순)
+    
+    columns를 지정하면 ORM 객체 대신 해당 컬럼만 조회한다 (엑셀 다운로드용).
+    """
+    req_start = parse_date(args.get('req_start', ''))
+    req_end = parse_date(args.get('req_end', ''))
+    approved = args.get('approved', '전체')
+    appr_start = parse_date(args.get('appr_start', ''))
+    appr_end = parse_date(args.get('appr_end', ''))
+    
+    if columns:
+        q = db.session.query(*columns).select_from(InsuranceApplication).outerjoin(
+            Member, InsuranceApplication.created_by_member_id == Member.id
+        )
+    else:
+        q = db.session.query(InsuranceApplication)
+    q = q.filter(InsuranceApplication.partner_group_id == partner_group_id)
+    
+    # 신청시간 기준 검색
+    req_start_dt, req_end_dt = day_range(req_start, req_end)
+    if req_start_dt:
+        q = q.filter(InsuranceApplication.created_at >= req_start_dt)
+    if req_end_dt:
+        q = q.filter(InsuranceApplication.created_at <= req_end_dt)
+    
+    # 승인여부 검색
+    if approved == '승인':
+        q = q.filter(InsuranceApplication.approved_at.is_not(None))
+    elif approved == '미승인':
+        q = q.filter(InsuranceApplication.approved_at.is_(None))
+    
+    # 조합승인시간 기준 검색
+    appr_start_dt, appr_end_dt = day_range(appr_start, appr_end)
+    if appr_start_dt:
+        q = q.filter(InsuranceApplication.approved_at >= appr_start_dt)
+    if appr_end_dt:
+        q = q.filter(InsuranceApplication.approved_at <= appr_end_dt)
+    
+    return q.order_by(InsuranceApplication.created_at.desc())
+
+
 @app.route('/partner/admin/insurance-approval', methods=['GET', 'POST'])
 def partner_admin_insurance_approval():
     try:
@@ -6470,241 +6730,106 @@ def partner_admin_insurance_approval():
             flash('파트너그룹 정보가 없습니다.', 'warning')
             return redirect(url_for('partner_dashboard'))
         
-        partner_group = db.session.query(PartnerGroup).filter_by(id=partner_group_id).first()
+        partner_group = g.partner_group
         if partner_group:
             partner_group_name = partner_group.name
         else:
             partner_group_name = session.get('partner_group_name', '')
         
+        args = request.args
+        
         if request.method == 'POST':
             action = request.form.get('action')
+            app_id = request.form.get('app_id')
             
+            # 액션별 단일 UPDATE/DELETE 문 구성
+            stmt = None
             if action == 'bulk_approve':
-                # 일괄 승인
-                applications = db.session.query(InsuranceApplication).filter_by(
-                    partner_group_id=partner_group_id,
-                    approved_at=None
-                ).all()
-                
-                now = datetime.now(KST)
-                for app in applications:
-                    app.approved_at = now
-                    app.status = '조합승인'
-                
+                # 일괄 승인: 행을 로드하지 않고 단일 UPDATE 문으로 처리
+                # (가입시간/종료시간은 승인 2시간 후 recompute_status에서 기록됨)
+                stmt = (
+                    update(InsuranceApplication)
+                    .where(
+                        InsuranceApplication.partner_group_id == partner_group_id,
+                        InsuranceApplication.approved_at.is_(None),
+                    )
+                    .values(approved_at=datetime.now(KST), status='조합승인')
+                )
+            elif action in ['save', 'delete', 'approve'] and app_id:
+                app_id = int(app_id)
+                # 소유권(partner_group_id) 확인을 WHERE 절에 포함하여 사전 SELECT 없이 처리
+                owned = (
+                    InsuranceApplication.id == app_id,
+                    InsuranceApplication.partner_group_id == partner_group_id,
+                )
+                if action == 'approve':
+                    stmt = (
+                        update(InsuranceApplication)
+                        .where(*owned)
+                        .values(approved_at=datetime.now(KST), status='조합승인')
+                    )
+                elif action == 'delete':
+                    stmt = delete(InsuranceApplication).where(*owned)
+                else:
+                    stmt = (
+                        update(InsuranceApplication)
+                        .where(*owned)
+                        .values(
+                            desired_start_date=parse_date(request.form.get('desired_start_date', '')),
+                            car_plate=request.form.get('car_plate', '').strip(),
+                            vin=request.form.get('vin', '').strip(),
+                            car_name=request.form.get('car_name', '').strip(),
+                            car_registered_at=parse_date(request.form.get('car_registered_at', '')),
+                            insured_code=request.form.get('insured_code', '').strip(),
+                            contractor_code=request.form.get('contractor_code', '').strip(),
+                            memo=request.form.get('memo', '').strip(),
+                        )
+                    )
+            
+            if stmt is not None:
+                success_msg, error_msg = _APPROVAL_ACTION_MESSAGES[action]
                 try:
-                    import sys
-                    sys.stderr.write(f"Insurance bulk approve: Approving {len(applications)} applications\n")
+                    # 요청당 하나의 트랜잭션: 문 실행 후 커밋은 한 번만 수행
+                    affected = db.session.execute(stmt).rowcount or 0
+                    
+                    if action != 'bulk_approve' and not affected:
+                        db.session.rollback()
+                        flash('신청 내역을 찾을 수 없습니다.', 'warning')
+                    elif safe_commit():
+                        app.logger.info("Insurance %s (approval): %s row(s) affected (app_id=%s)", action, affected, app_id)
+                        flash(success_msg.format(count=affected), 'success')
+                    else:
+                        app.logger.error("Insurance %s (approval): commit failed (app_id=%s)", action, app_id)
+                        flash(error_msg, 'danger')
                 except Exception:
-                    pass
-                
-                commit_success = safe_commit()
-                
-                if commit_success:
-                    try:
-                        import sys
-                        sys.stderr.write(f"Insurance bulk approve: Successfully approved {len(applications)} applications\n")
-                    except Exception:
-                        pass
-                    flash(f'{len(applications)}건이 일괄 승인되었습니다.', 'success')
-                else:
+                    app.logger.exception("Insurance %s (approval) failed (app_id=%s)", action, app_id)
                     try:
-                        import sys
-                        import traceback
-                        sys.stderr.write(f"Insurance bulk approve: Commit failed\n")
-                        sys.stderr.write(f"Insurance bulk approve traceback: {traceback.format_exc()}\n")
+                        db.session.rollback()
                     except Exception:
                         pass
-                    flash('일괄 승인 처리 중 오류가 발생했습니다.', 'danger')
+                    flash(error_msg, 'danger')
             
-            elif action in ['save', 'delete', 'approve']:
-                app_id = request.form.get('app_id')
-                if app_id:
-                    application = db.session.get(InsuranceApplication, int(app_id))
-                    if application and application.partner_group_id == partner_group_id:
-                        if action == 'approve':
-                            try:
-                                app_id = application.id
-                                now = datetime.now(KST)
-                                application.approved_at = now
-                                application.status = '조합승인'
-                                
-                                try:
-                                    import sys
-                                    sys.stderr.write(f"Insurance approve: Approving application ID {app_id}\n")
-                                except Exception:
-                                    pass
-                                
-                                commit_success = safe_commit()
-                                
-                                if commit_success:
-                                    try:
-                                        import sys
-                                        sys.stderr.write(f"Insurance approve: Successfully approved application ID {app_id}\n")
-                                    except Exception:
-                                        pass
-                                    flash('승인되었습니다.', 'success')
-                                else:
-                                    try:
-                                        import sys
-                                        import traceback
-                                        sys.stderr.write(f"Insurance approve: Commit failed for ID {app_id}\n")
-                                        sys.stderr.write(f"Insurance approve traceback: {traceback.format_exc()}\n")
-                                    except Exception:
-                                        pass
-                                    flash('승인 처리 중 오류가 발생했습니다.', 'danger')
-                            except Exception as e:
-                                try:
-                                    import sys
-                                    import traceback
-                                    sys.stderr.write(f"Insurance approve error: {e}\n")
-                                    sys.stderr.write(f"Insurance approve traceback: {traceback.format_exc()}\n")
-                                except Exception:
-                                    pass
-                                try:
-                                    db.session.rollback()
-                                except Exception:
-                                    pass
-                                flash('승인 처리 중 오류가 발생했습니다.', 'danger')
-                        
-                        elif action == 'delete':
-                            try:
-                                app_id = application.id
-                                db.session.delete(application)
-                                
-                                try:
-                                    import sys
-                                    sys.stderr.write(f"Insurance delete (approval): Deleting application ID {app_id}\n")
-                                except Exception:
-                                    pass
-                                
-                                commit_success = safe_commit()
-                                
-                                if commit_success:
-                                    try:
-                                        import sys
-                                        sys.stderr.write(f"Insurance delete (approval): Successfully deleted ID {app_id}\n")
-                                    except Exception:
-                                        pass
-                                    flash('삭제되었습니다.', 'success')
-                                else:
-                                    try:
-                                        import sys
-                                        import traceback
-                                        sys.stderr.write(f"Insurance delete (approval): Commit failed for ID {app_id}\n")
-                                        sys.stderr.write(f"Insurance delete traceback: {traceback.format_exc()}\n")
-                                    except Exception:
-                                        pass
-                                    flash('삭제 처리 중 오류가 발생했습니다.', 'danger')
-                            except Exception as e:
-                                try:
-                                    import sys
-                                    import traceback
-                                    sys.stderr.write(f"Insurance deletion error: {e}\n")
-                                    sys.stderr.write(f"Insurance deletion traceback: {traceback.format_exc()}\n")
-                                except Exception:
-                                    pass
-                                try:
-                                    db.session.rollback()
-                                except Exception:
-                                    pass
-                                flash('삭제 처리 중 오류가 발생했습니다.', 'danger')
-                        
-                        elif action == 'save':
-                            try:
-                                app_id = application.id
-                                application.desired_start_date = parse_date(request.form.get('desired_start_date', ''))
-                                application.car_plate = request.form.get('car_plate', '').strip()
-                                application.vin = request.form.get('vin', '').strip()
-                                application.car_name = request.form.get('car_name', '').strip()
-                                application.car_registered_at = parse_date(request.form.get('car_registered_at', ''))
-                                application.insured_code = request.form.get('insured_code', '').strip()
-                                application.contractor_code = request.form.get('contractor_code', '').strip()
-                                application.memo = request.form.get('memo', '').strip()
-                                
-                                try:
-                                    import sys
-                                    sys.stderr.write(f"Insurance save (approval): Updating application ID {app_id}\n")
-                                except Exception:
-                                    pass
-                                
-                                commit_success = safe_commit()
-                                
-                                if commit_success:
-                                    try:
-                                        import sys
-                                        verify_app = db.session.get(InsuranceApplication, app_id)
-                                        if verify_app:
-                                            sys.stderr.write(f"Insurance save (approval): Verified application ID {app_id} exists\n")
-                                        else:
-                                            sys.stderr.write(f"Insurance save (approval): WARNING - Application ID {app_id} not found after commit!\n")
-                                    except Exception:
-                                        pass
-                                    flash('저장되었습니다.', 'success')
-                                else:
-                                    try:
-                                        import sys
-                                        import traceback
-                                        sys.stderr.write(f"Insurance save (approval): Commit failed for ID {app_id}\n")
-                                        sys.stderr.write(f"Insurance save traceback: {traceback.format_exc()}\n")
-                                    except Exception:
-                                        pass
-                                    flash('저장 처리 중 오류가 발생했습니다.', 'danger')
-                            except Exception as e:
-                                try:
-                                    import sys
-                                    import traceback
-                                    sys.stderr.write(f"Insurance save error: {e}\n")
-                                    sys.stderr.write(f"Insurance save traceback: {traceback.format_exc()}\n")
-                                except Exception:
-                                    pass
-                                try:
-                                    db.session.rollback()
-                                except Exception:
-                                    pass
-                                flash('저장 처리 중 오류가 발생했습니다.', 'danger')
-            
-            return redirect(url_for('partner_admin_insurance_approval', 
-                                  req_start=request.args.get('req_start'),
-                                  req_end=request.args.get('req_end'),
-                                  approved=request.args.get('approved'),
-                                  appr_start=request.args.get('appr_start'),
-                                  appr_end=request.args.get('appr_end'),
-                                  edit_id=request.args.get('edit_id')))
+            # 검색 조건 유지 (값이 없는 파라미터는 쿼리스트링에서 제외)
+            return redirect(url_for('partner_admin_insurance_approval',
+                                  **{k: args[k] for k in _APPROVAL_FILTER_ARGS if args.get(k)}))
         
         # 검색 조건
-        req_start = parse_date(request.args.get('req_start', ''))
-        req_end = parse_date(request.args.get('req_end', ''))
-        approved = request.args.get('approved', '전체')
-        appr_start = parse_date(request.args.get('appr_start', ''))
-        appr_end = parse_date(request.args.get('appr_end', ''))
-        edit_id = request.args.get('edit_id')
-        
-        q = db.session.query(InsuranceApplication).filter_by(partner_group_id=partner_group_id)
-        
-        # 신청시간 기준 검색
-        if req_start:
-            q = q.filter(InsuranceApplication.created_at >= datetime.combine(req_start, datetime.min.time(), tzinfo=KST))
-        if req_end:
-            q = q.filter(InsuranceApplication.created_at <= datetime.combine(req_end, datetime.max.time(), tzinfo=KST))
-        
-        # 승인여부 검색
-        if approved == '승인':
-            q = q.filter(InsuranceApplication.approved_at.is_not(None))
-        elif approved == '미승인':
-            q = q.filter(InsuranceApplication.approved_at.is_(None))
-        
-        # 조합승인시간 기준 검색
-        if appr_start:
-            q = q.filter(InsuranceApplication.approved_at >= datetime.combine(appr_start, datetime.min.time(), tzinfo=KST))
-        if appr_end:
-            q = q.filter(InsuranceApplication.approved_at <= datetime.combine(appr_end, datetime.max.time(), tzinfo=KST))
-        
-        applications = q.order_by(InsuranceApplication.created_at.desc()).all()
-        
-        # 상태 재계산
-        for app in applications:
-            app.recompute_status()
-        safe_commit()
+        req_start = parse_date(args.get('req_start', ''))
+        req_end = parse_date(args.get('req_end', ''))
+        approved = args.get('approved', '전체')
+        appr_start = parse_date(args.get('appr_start', ''))
+        appr_end = parse_date(args.get('appr_end', ''))
+        edit_id = args.get('edit_id')
+        
+        applications = _insurance_approval_query(partner_group_id, args).all()
+        
+        # 상태 재계산 (변경된 행이 있을 때만 커밋)
+        changed = False
+        for ins_app in applications:
+            if ins_app.recompute_status():
+                changed = True
+        if changed:
+            safe_commit()
         
         return render_template('partner/admin_insurance_approval.html',
                              applications=applications,
@@ -6716,14 +6841,8 @@ def partner_admin_insurance_approval():
                              appr_end=appr_end,
                              edit_id=edit_id)
         
-    except Exception as e:
-        try:
-            import sys
-            import traceback
-            sys.stderr.write(f"Partner admin insurance approval error: {e}\n")
-            sys.stderr.write(f"Partner admin insurance approval traceback: {traceback.format_exc()}\n")
-        except Exception:
-            pass
+    except Exception:
+        app.logger.exception("Partner admin insurance approval failed")
         flash('페이지 로드 중 오류가 발생했습니다.', 'danger')
         return redirect(url_for('partner_admin'))
 
@@ -6743,74 +6862,64 @@ def partner_admin_insurance_approval_export():
             flash('파트너그룹 정보가 없습니다.', 'warning')
             return redirect(url_for('partner_dashboard'))
         
-        import pandas as pd
-        from io import BytesIO
-        
-        # 검색 조건 (동일한 필터 적용)
-        req_start = parse_date(request.args.get('req_start', ''))
-        req_end = parse_date(request.args.get('req_end', ''))
-        approved = request.args.get('approved', '전체')
-        appr_start = parse_date(request.args.get('appr_start', ''))
-        appr_end = parse_date(request.args.get('appr_end', ''))
-        
         if db is None:
             flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
             return redirect(url_for('partner_admin_insurance_approval'))
         
-        # 보험신청 데이터 조회 (동일한 필터)
-        q = db.session.query(InsuranceApplication).filter_by(partner_group_id=partner_group_id)
-        
-        # 신청시간 기준 검색
-        if req_start:
-            q = q.filter(InsuranceApplication.created_at >= datetime.combine(req_start, datetime.min.time(), tzinfo=KST))
-        if req_end:
-            q = q.filter(InsuranceApplication.created_at <= datetime.combine(req_end, datetime.max.time(), tzinfo=KST))
-        
-        # 승인여부 검색
-        if approved == '승인':
-            q = q.filter(InsuranceApplication.approved_at.is_not(None))
-        elif approved == '미승인':
-            q = q.filter(InsuranceApplication.approved_at.is_(None))
-        
-        # 조합승인시간 기준 검색
-        if appr_start:
-            q = q.filter(InsuranceApplication.approved_at >= datetime.combine(appr_start, datetime.min.time(), tzinfo=KST))
-        if appr_end:
-            q = q.filter(InsuranceApplication.approved_at <= datetime.combine(appr_end, datetime.max.time(), tzinfo=KST))
-        
-        applications = q.order_by(InsuranceApplication.created_at.desc()).all()
-        
-        # 엑셀 데이터 생성
-        data = []
-        for app in applications:
-            data.append({
-                '순번': len(data) + 1,
-                '상사명': app.created_by_member.company_name if app.created_by_member else '',
-                '대표자': app.created_by_member.representative if app.created_by_member else '',
-                '사업자번호': app.created_by_member.business_number if app.created_by_member else '',
-                '신청시간': app.created_at.strftime('%Y-%m-%d %H:%M:%S') if app.created_at else '',
-                '가입희망일자': app.desired_start_date.strftime('%Y-%m-%d') if app.desired_start_date else '',
-                '가입시간': app.start_at.strftime('%Y-%m-%d %H:%M:%S') if app.start_at else '',
-                '종료시간': app.end_at.strftime('%Y-%m-%d %H:%M:%S') if app.end_at else '',
-                '조합승인시간': app.approved_at.strftime('%Y-%m-%d %H:%M:%S') if app.approved_at else '',
-                '피보험자코드': app.insured_code or '',
-                '계약자코드': app.contractor_code or '',
-                '한글차량번호': app.car_plate or '',
-                '차대번호': app.vin or '',
-                '차량명': app.car_name or '',
-                '차량등록일자': app.car_registered_at.strftime('%Y-%m-%d') if app.car_registered_at else '',
-                '보험료': app.premium or 0,
-                '상태': app.status or '',
-                '비고': app.memo or '',
-            })
+        # 보험신청 데이터 조회 (화면과 동일한 필터, ORM 객체 없이 필요한 컬럼만 스트리밍)
+        # 날짜/시간은 DB에서 문자열로 포맷하여 행마다 strftime을 호출하지 않음
+        rows = _insurance_approval_query(
+            partner_group_id, request.args,
+            Member.company_name,
+            Member.representative,
+            Member.business_number,
+            sql_datetime_str(InsuranceApplication.created_at),
+            sql_datetime_str(InsuranceApplication.desired_start_date, '%Y-%m-%d'),
+            sql_datetime_str(InsuranceApplication.start_at),
+            sql_datetime_str(InsuranceApplication.end_at),
+            sql_datetime_str(InsuranceApplication.approved_at),
+            InsuranceApplication.insured_code,
+            InsuranceApplication.contractor_code,
+            InsuranceApplication.car_plate,
+            InsuranceApplication.vin,
+            InsuranceApplication.car_name,
+            sql_datetime_str(InsuranceApplication.car_registered_at, '%Y-%m-%d'),
+            InsuranceApplication.premium,
+            InsuranceApplication.status,
+            InsuranceApplication.memo,
+        ).yield_per(1000)
+        
+        # 엑셀 데이터 생성 (행을 바로 워크시트에 기록)
+        headers = ['순번', '상사명', '대표자', '사업자번호', '신청시간', '가입희망일자', '가입시간', '종료시간',
+                   '조합승인시간', '피보험자코드', '계약자코드', '한글차량번호', '차대번호', '차량명', '차량등록일자',
+                   '보험료', '상태', '비고']
+        
+        def export_rows():
+            for row_num, r in enumerate(rows, 1):
+                yield (
+                    row_num,
+                    r.company_name or '',
+                    r.representative or '',
+                    r.business_number or '',
+                    r.created_at or '',
+                    r.desired_start_date or '',
+                    r.start_at or '',
+                    r.end_at or '',
+                    r.approved_at or '',
+                    r.insured_code or '',
+                    r.contractor_code or '',
+                    r.car_plate or '',
+                    r.vin or '',
+                    r.car_name or '',
+                    r.car_registered_at or '',
+                    r.premium or 0,
+                    r.status or '',
+                    r.memo or '',
+                )
         
-        df = pd.DataFrame(data)
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='책임보험승인')
-        buffer.seek(0)
+        buffer = build_xlsx('책임보험승인', headers, export_rows())
         
-        partner_group = db.session.query(PartnerGroup).filter_by(id=partner_group_id).first()
+        partner_group = g.partner_group
         partner_group_name = partner_group.name if partner_group else '파트너그룹'
         filename = f'{partner_group_name}_책임보험승인_{datetime.now(KST).strftime("%Y%m%d_%H%M%S")}.xlsx'
         return send_file(
@@ -6819,17 +6928,55 @@ def partner_admin_insurance_approval_export():
             download_name=filename,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         )
-    except Exception as e:
-        try:
-            import sys
-            import traceback
-            sys.stderr.write(f"Partner admin insurance approval export error: {e}\n")
-            sys.stderr.write(f"Partner admin insurance approval export traceback: {traceback.format_exc()}\n")
-        except Exception:
-            pass
+    except Exception:
+        app.logger.exception("Partner admin insurance approval export failed")
         flash('엑셀 다운로드 중 오류가 발생했습니다.', 'danger')
         return redirect(url_for('partner_admin_insurance_approval'))
 
+
+def _partner_settlements(partner_group_id, start_period, next_month):
+    """파트너그룹 월별 회원사 정산 집계 (화면/엑셀 공용)
+    
+    신청 건은 created_by_member_id(정수)로 집계하고, 회원사 정보는 마지막에 한 번에 조회한다.
+    상사명/대표자/사업자번호 순으로 정렬된 dict 목록을 반환한다.
+    """
+    member_ids = db.session.query(InsuranceApplication.created_by_member_id).filter(
+        InsuranceApplication.partner_group_id == partner_group_id,
+        InsuranceApplication.created_by_member_id.is_not(None),
+        InsuranceApplication.start_at.is_not(None),
+        InsuranceApplication.start_at >= start_period,
+        InsuranceApplication.start_at < next_month,
+    )
+    
+    counts = {}
+    for (member_id,) in member_ids:
+        counts[member_id] = counts.get(member_id, 0) + 1
+    if not counts:
+        return []
+    
+    members = db.session.query(
+        Member.id,
+        Member.company_name,
+        Member.representative,
+        Member.business_number,
+        Member.settlement_method,
+    ).filter(Member.id.in_(counts.keys())).all()
+    
+    settlements = [
+        {
+            'company_name': m.company_name or '',
+            'representative': m.representative or '',
+            'business_number': m.business_number or '',
+            'settlement_method': m.settlement_method or '포인트',
+            'count': counts[m.id],
+            'amount': counts[m.id] * 9500,  # 건수 × 9,500원
+        }
+        for m in members
+    ]
+    settlements.sort(key=lambda s: (s['company_name'], s['representative'], s['business_number']))
+    return settlements
+
+
 # 파트너그룹 정산 페이지
 @app.route('/partner/admin/settlement', methods=['GET', 'POST'])
 def partner_admin_settlement():
@@ -6846,7 +6993,7 @@ def partner_admin_settlement():
             flash('파트너그룹 정보가 없습니다.', 'warning')
             return redirect(url_for('partner_dashboard'))
         
-        partner_group = db.session.query(PartnerGroup).filter_by(id=partner_group_id).first()
+        partner_group = g.partner_group
         if not partner_group:
             flash('파트너그룹을 찾을 수 없습니다.', 'warning')
             return redirect(url_for('partner_dashboard'))
@@ -6877,49 +7024,10 @@ def partner_admin_settlement():
         else:
             next_month = datetime(year, month + 1, 1, tzinfo=KST)
         
-        applications = db.session.query(InsuranceApplication).filter(
-            InsuranceApplication.partner_group_id == partner_group_id,
-            InsuranceApplication.start_at.is_not(None),
-            InsuranceApplication.start_at >= start_period,
-            InsuranceApplication.start_at < next_month,
-        ).all()
+        settlements = _partner_settlements(partner_group_id, start_period, next_month)
         
-        # 회사별 정산 데이터 집계
-        settlements = {}
-        for app in applications:
-            try:
-                # created_by_member가 None일 수 있으므로 안전하게 처리
-                if app.created_by_member:
-                    company_name = app.created_by_member.company_name or ''
-                    representative = app.created_by_member.representative or ''
-                    business_number = app.created_by_member.business_number or ''
-                    settlement_method = app.created_by_member.settlement_method or '포인트'
-                    
-                    company_key = (company_name, representative, business_number)
-                    if company_key not in settlements:
-                        settlements[company_key] = {
-                            'company_name': company_name,
-                            'representative': representative,
-                            'business_number': business_number,
-                            'settlement_method': settlement_method,
-                            'count': 0,
-                            'amount': 0
-                        }
-                    else:
-                        if not settlements[company_key].get('settlement_method'):
-                            settlements[company_key]['settlement_method'] = settlement_method
-                    settlements[company_key]['count'] += 1
-                    settlements[company_key]['amount'] += 9500  # 건수 × 9,500원
-            except Exception as app_err:
-                try:
-                    import sys
-                    sys.stderr.write(f"Settlement aggregation error for app {app.id}: {app_err}\n")
-                except Exception:
-                    pass
-                continue
-        
-        total_count = sum(s['count'] for s in settlements.values())
-        total_amount = sum(s['amount'] for s in settlements.values())
+        total_count = sum(s['count'] for s in settlements)
+        total_amount = sum(s['amount'] for s in settlements)
         
         # PartnerGroup 객체를 딕셔너리로 변환 (JSON 직렬화 가능하도록)
         partner_group_dict = None
@@ -6937,7 +7045,7 @@ def partner_admin_settlement():
             }
         
         return render_template('partner/admin_settlement.html',
-                             settlements=list(settlements.values()),
+                             settlements=settlements,
                              partner_group=partner_group_dict,
                              partner_group_name=partner_group_name,
                              year=year,
@@ -6945,14 +7053,8 @@ def partner_admin_settlement():
                              total_count=total_count,
                              total_amount=total_amount)
         
-    except Exception as e:
-        try:
-            import sys
-            import traceback
-            sys.stderr.write(f"Partner admin settlement error: {e}\n")
-            sys.stderr.write(f"Partner admin settlement traceback: {traceback.format_exc()}\n")
-        except Exception:
-            pass
+    except Exception:
+        app.logger.exception("Partner admin settlement failed")
         flash('페이지 로드 중 오류가 발생했습니다.', 'danger')
         return redirect(url_for('partner_admin'))
 
@@ -6962,8 +7064,6 @@ def partner_admin_settlement_export():
     """파트너 정산 결과를 엑셀로 다운로드"""
     try:
         ensure_initialized()
-        import pandas as pd
-        from io import BytesIO
         
         # 파트너그룹 관리자만 접근 가능
         if 'user_type' not in session or session['user_type'] != 'partner_admin':
@@ -6975,7 +7075,7 @@ def partner_admin_settlement_export():
             flash('파트너그룹 정보가 없습니다.', 'warning')
             return redirect(url_for('partner_dashboard'))
         
-        partner_group = db.session.query(PartnerGroup).filter_by(id=partner_group_id).first()
+        partner_group = g.partner_group
         if not partner_group:
             flash('파트너그룹을 찾을 수 없습니다.', 'warning')
             return redirect(url_for('partner_dashboard'))
@@ -7006,83 +7106,35 @@ def partner_admin_settlement_export():
         else:
             next_month = datetime(year, month + 1, 1, tzinfo=KST)
         
-        applications = db.session.query(InsuranceApplication).filter(
-            InsuranceApplication.partner_group_id == partner_group_id,
-            InsuranceApplication.start_at.is_not(None),
-            InsuranceApplication.start_at >= start_period,
-            InsuranceApplication.start_at < next_month,
-        ).all()
-        
-        # 회사별 정산 데이터 집계
-        settlements = {}
-        for app in applications:
-            try:
-                if app.created_by_member:
-                    company_name = app.created_by_member.company_name or ''
-                    representative = app.created_by_member.representative or ''
-                    business_number = app.created_by_member.business_number or ''
-                    settlement_method = app.created_by_member.settlement_method or '포인트'
-                    
-                    company_key = (company_name, representative, business_number)
-                    if company_key not in settlements:
-                        settlements[company_key] = {
-                            'company_name': company_name,
-                            'representative': representative,
-                            'business_number': business_number,
-                            'settlement_method': settlement_method,
-                            'count': 0,
-                            'amount': 0
-                        }
-                    else:
-                        if not settlements[company_key].get('settlement_method'):
-                            settlements[company_key]['settlement_method'] = settlement_method
-                    settlements[company_key]['count'] += 1
-                    settlements[company_key]['amount'] += 9500  # 건수 × 9,500원
-            except Exception:
-                continue
+        settlements = _partner_settlements(partner_group_id, start_period, next_month)
         
         # 엑셀 데이터 생성
         data = []
-        row_num = 1
         total_count = 0
         total_amount = 0
         
-        for company_key in sorted(settlements.keys()):
-            settlement = settlements[company_key]
+        for row_num, settlement in enumerate(settlements, 1):
             total_count += settlement['count']
             total_amount += settlement['amount']
             
-            data.append({
-                '순번': row_num,
-                '상사명': settlement['company_name'],
-                '대표자': settlement['representative'],
-                '사업자번호': settlement['business_number'],
-                '대금정산방법': settlement['settlement_method'],
-                '건수': settlement['count'],
-                '금액': settlement['amount'],
-                '비고': '',
-            })
-            row_num += 1
+            data.append((
+                row_num,
+                settlement['company_name'],
+                settlement['representative'],
+                settlement['business_number'],
+                settlement['settlement_method'],
+                settlement['count'],
+                settlement['amount'],
+                '',
+            ))
         
         # 합계 행 추가
         if data:
-            data.append({
-                '순번': '',
-                '상사명': '합계',
-                '대표자': '',
-                '사업자번호': '',
-                '대금정산방법': '',
-                '건수': total_count,
-                '금액': total_amount,
-                '비고': '',
-            })
+            data.append(('', '합계', '', '', '', total_count, total_amount, ''))
         
-        # DataFrame 생성 및 엑셀 파일 생성
-        df = pd.DataFrame(data)
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='정산내역')
-        buffer.seek(0)
+        # 엑셀 파일 생성
+        headers = ['순번', '상사명', '대표자', '사업자번호', '대금정산방법', '건수', '금액', '비고']
+        buffer = build_xlsx('정산내역', headers, data)
         
         filename = f'{partner_group_name}_정산내역_{year}년{month}월_{datetime.now(KST).strftime("%Y%m%d_%H%M%S")}.xlsx'
         return send_file(
@@ -7092,14 +7144,8 @@ def partner_admin_settlement_export():
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         )
         
-    except Exception as e:
-        try:
-            import sys
-            import traceback
-            sys.stderr.write(f"Partner admin settlement export error: {e}\n")
-            sys.stderr.write(f"Traceback: {traceback.format_exc()}\n")
-        except Exception:
-            pass
+    except Exception:
+        app.logger.exception("Partner admin settlement export failed")
         flash('엑셀 다운로드 중 오류가 발생했습니다.', 'danger')
         return redirect(url_for('partner_admin_settlement'))
 
@@ -7112,6 +7158,108 @@ def admin_home():
     return redirect(url_for('admin_dashboard'))
 
 
+# 파트너그룹 선택 목록 캐시 (id, name) - 프로세스 내, 5분 TTL
+_PARTNER_GROUP_CHOICES_TTL = 300
+_partner_group_choices_cache = {'value': None, 'expires': 0.0, 'generation': 0}
+
+
+def get_partner_group_choices():
+    """이름순 파트너그룹 (id, name) 목록
+    
+    PartnerGroup 추가/수정/삭제(flush 또는 벌크 UPDATE/DELETE)가 포함된 트랜잭션이 커밋되거나 롤백되면 즉시 무효화되고,
+    다른 워커 프로세스의 변경은 TTL 이내에 반영된다.
+    """
+    cache = _partner_group_choices_cache
+    now = monotonic()
+    value = cache['value']
+    if value is None or now >= cache['expires']:
+        generation = cache['generation']
+        value = db.session.query(PartnerGroup.id, PartnerGroup.name).order_by(PartnerGroup.name).all()
+        # 조회 도중 무효화되었으면 이전 데이터일 수 있으므로 저장하지 않음
+        if generation == cache['generation']:
+            cache['value'] = value
+            cache['expires'] = now + _PARTNER_GROUP_CHOICES_TTL
+    return value
+
+
+def _clear_partner_group_choices():
+    _partner_group_choices_cache['generation'] += 1
+    _partner_group_choices_cache['value'] = None
+
+
+# flush 시점에는 아직 커밋 전이므로 변경 여부만 세션에 표시하고, 실제 무효화는 커밋/롤백 후에 수행
+@event.listens_for(Session, 'after_flush')
+def _mark_partner_group_choices_dirty(session, flush_context):
+    pg_cls = globals().get('PartnerGroup')
+    if pg_cls is None or session.info.get('partner_group_choices_dirty'):
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, pg_cls):
+            session.info['partner_group_choices_dirty'] = True
+            return
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_partner_group_choices_dirty_on_bulk(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is globals().get('PartnerGroup'):
+        orm_execute_state.session.info['partner_group_choices_dirty'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_partner_group_choices_on_commit(session):
+    if session.info.pop('partner_group_choices_dirty', False):
+        _clear_partner_group_choices()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _invalidate_partner_group_choices_on_rollback(session, previous_transaction):
+    if session.info.get('partner_group_choices_dirty'):
+        _clear_partner_group_choices()
+        if not session.in_transaction():
+            session.info.pop('partner_group_choices_dirty', None)
+
+
+# 사업자등록증 업로드 저장
+_UPLOAD_COPY_BUFSIZE = 64 * 1024
+_ALLOWED_CERT_EXTS = ('.pdf', '.jpg', '.jpeg', '.png')
+
+
+def _remove_file_quietly(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def save_cert_upload(file, filepath):
+    """업로드 파일을 filepath에 저장하고 저장 여부를 반환
+    
+    filepath + '.tmp'에 먼저 기록한 뒤 os.replace로 옮기므로 중간에 실패해도 반쯤 쓴 파일이 남지 않는다.
+    True를 반환한 시점에는 파일이 이미 디스크에 있으므로, 호출자는 그 뒤에 DB 커밋과 기존 파일 삭제를 진행한다.
+    """
+    stream = file.stream
+    
+    # 64KB 버퍼로 복사 (file.save의 기본 16KB 청크보다 read/write 호출 횟수 감소)
+    tmp_path = filepath + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as out:
+            shutil.copyfileobj(stream, out, length=_UPLOAD_COPY_BUFSIZE)
+            # 파일이 실제로 기록되었는지 확인 (별도 stat 호출 없이 기록 위치로 판단)
+            written = out.tell()
+        if written > 0:
+            os.replace(tmp_path, filepath)
+            return True
+    except Exception:
+        _remove_file_quietly(tmp_path)
+        app.logger.exception("Registration cert save failed (path=%s)", filepath)
+        raise
+    _remove_file_quietly(tmp_path)
+    return False
+
+
 @app.route('/admin/members', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -7141,35 +7289,30 @@ def admin_members():
                     m.role = request.form.get('role', m.role or 'member')
                     m.memo = request.form.get('memo', '').strip()
                     
-                    # 사업자등록증 파일 업로드 처리
+                    # 사업자등록증 파일 업로드 처리 (기존 파일은 커밋 성공 후 삭제)
+                    replaced_cert_filepath = None
                     if 'registration_cert' in request.files:
                         try:
                             file = request.files['registration_cert']
                             if file and file.filename:
-                                allowed_extensions = {'.pdf', '.jpg', '.jpeg', '.png'}
-                                file_ext = os.path.splitext(file.filename)[1].lower()
-                                if file_ext in allowed_extensions:
+                                fname_lower = file.filename.lower()
+                                if fname_lower.endswith(_ALLOWED_CERT_EXTS):
+                                    file_ext = '.' + fname_lower.rsplit('.', 1)[1]
                                     # 업로드 디렉토리 확인 및 생성
                                     os.makedirs(UPLOAD_DIR, exist_ok=True)
                                     
-                                    # 기존 파일이 있으면 삭제 (선택사항)
-                                    if m.registration_cert_path:
-                                        old_filepath = os.path.join(UPLOAD_DIR, m.registration_cert_path.split('/')[-1])
-                                        try:
-                                            if os.path.exists(old_filepath):
-                                                os.remove(old_filepath)
-                                        except Exception:
-                                            pass  # 기존 파일 삭제 실패해도 계속 진행
-                                    
                                     # 새 파일 저장
-                                    timestamp = datetime.now(KST).strftime('%Y%m%d_%H%M%S')
+                                    timestamp = time_ns()  # 파일명 고유값 (초 단위 시각 문자열보다 저렴하고 충돌 없음)
                                     business_number = m.business_number or 'unknown'
                                     filename = f"{business_number}_{timestamp}{file_ext}"
                                     filepath = os.path.join(UPLOAD_DIR, filename)
-                                    file.save(filepath)
                                     
-                                    # 파일이 실제로 저장되었는지 확인
-                                    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+                                    # save_cert_upload가 True를 반환하면 새 파일이 이미 디스크에 있으므로 그때만 기존 파일을 삭제 대상으로 지정
+                                    if save_cert_upload(file, filepath):
+                                        if m.registration_cert_path:
+                                            replaced_cert_filepath = os.path.join(UPLOAD_DIR, m.registration_cert_path.split('/')[-1])
+                                            if replaced_cert_filepath == filepath:
+                                                replaced_cert_filepath = None
                                         m.registration_cert_path = os.path.join('uploads', filename)
                                         print(f"Registration cert updated successfully: {m.registration_cert_path}")
                                     else:
@@ -7190,6 +7333,8 @@ def admin_members():
                     if not safe_commit():
                         flash('저장 처리 중 오류가 발생했습니다.', 'danger')
                     else:
+                        if replaced_cert_filepath:
+                            _remove_file_quietly(replaced_cert_filepath)
                         flash('저장되었습니다.', 'success')
                     return redirect(url_for('admin_members'))
                 elif action == 'delete':
@@ -7238,19 +7383,17 @@ def admin_members():
                         try:
                             file = request.files['registration_cert']
                             if file and file.filename:
-                                allowed_extensions = {'.pdf', '.jpg', '.jpeg', '.png'}
-                                file_ext = os.path.splitext(file.filename)[1].lower()
-                                if file_ext in allowed_extensions:
+                                fname_lower = file.filename.lower()
+                                if fname_lower.endswith(_ALLOWED_CERT_EXTS):
+                                    file_ext = '.' + fname_lower.rsplit('.', 1)[1]
                                     # 업로드 디렉토리 확인 및 생성
                                     os.makedirs(UPLOAD_DIR, exist_ok=True)
                                     
-                                    timestamp = datetime.now(KST).strftime('%Y%m%d_%H%M%S')
+                                    timestamp = time_ns()  # 파일명 고유값 (초 단위 시각 문자열보다 저렴하고 충돌 없음)
                                     filename = f"{business_number}_{timestamp}{file_ext}"
                                     filepath = os.path.join(UPLOAD_DIR, filename)
-                                    file.save(filepath)
                                     
-                                    # 파일이 실제로 저장되었는지 확인
-                                    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+                                    if save_cert_upload(file, filepath):
                                         registration_cert_path = os.path.join('uploads', filename)
                                         print(f"Registration cert saved successfully: {registration_cert_path}")
                                     else:
@@ -7298,10 +7441,10 @@ def admin_members():
         return redirect(url_for('dashboard'))
     members = db.session.query(Member).order_by(Member.created_at.desc()).all()
     
-    # 파트너그룹 목록 가져오기
+    # 파트너그룹 목록 가져오기 (선택 목록용 id/name, 캐시 사용)
     partner_groups = []
     try:
-        partner_groups = db.session.query(PartnerGroup).order_by(PartnerGroup.name).all()
+        partner_groups = get_partner_group_choices()
     except Exception:
         pass
     
@@ -7324,43 +7467,65 @@ def admin_members_upload():
         flash('엑셀 파일을 선택하세요.', 'warning')
         return redirect(url_for('admin_members'))
     try:
-        # Import pandas only when needed
-        import pandas as pd
-        df = pd.read_excel(file)
-        created = 0
-        skipped = 0
-        required_cols = {'username', 'company_name', 'business_number'}
-        if not required_cols.issubset(set(df.columns)):
-            flash('엑셀 컬럼이 올바르지 않습니다. (필수: username, company_name, business_number)', 'danger')
-            return redirect(url_for('admin_members'))
-        for _, row in df.iterrows():
-            username = str(row.get('username', '')).strip()
-            company_name = str(row.get('company_name', '')).strip()
-            business_number = str(row.get('business_number', '')).strip()
-            if not username or not company_name or not business_number:
-                skipped += 1
-                continue
-            # Dup checks
-            if db.session.query(Member).filter((Member.username == username) | (Member.business_number == business_number)).first():
-                skipped += 1
-                continue
-            m = Member(
-                username=username,
-                company_name=company_name,
-                address=str(row.get('address', '') or '').strip(),
-                business_number=business_number,
-                corporation_number=str(row.get('corporation_number', '') or '').strip(),
-                representative=str(row.get('representative', '') or '').strip(),
-                phone=str(row.get('phone', '') or '').strip(),
-                mobile=str(row.get('mobile', '') or '').strip(),
-                email=str(row.get('email', '') or '').strip(),
-                approval_status=str(row.get('approval_status', '승인') or '승인').strip() or '승인',
-                role=str(row.get('role', 'member') or 'member').strip() or 'member',
-            )
-            password = str(row.get('password', 'temp1234'))
-            m.set_password(password)
-            db.session.add(m)
-            created += 1
+        # DataFrame 없이 read-only 모드로 행을 순차 읽기
+        wb = load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            headers = next(rows, None) or ()
+            idx = {h: i for i, h in enumerate(headers) if h is not None}
+            created = 0
+            skipped = 0
+            required_cols = {'username', 'company_name', 'business_number'}
+            if not required_cols.issubset(idx):
+                flash('엑셀 컬럼이 올바르지 않습니다. (필수: username, company_name, business_number)', 'danger')
+                return redirect(url_for('admin_members'))
+            
+            def cell(row, name, default=''):
+                i = idx.get(name)
+                value = row[i] if i is not None and i < len(row) else None
+                if value is None:
+                    return default
+                return str(value).strip() or default
+            
+            # 중복 검사용 기존 아이디/사업자번호를 한 번에 조회
+            existing = db.session.query(Member.username, Member.business_number).all()
+            usernames = {u for u, _ in existing}
+            business_numbers = {b for _, b in existing}
+            
+            for row in rows:
+                if all(v is None for v in row):
+                    continue
+                username = cell(row, 'username')
+                company_name = cell(row, 'company_name')
+                business_number = cell(row, 'business_number')
+                if not username or not company_name or not business_number:
+                    skipped += 1
+                    continue
+                # Dup checks
+                if username in usernames or business_number in business_numbers:
+                    skipped += 1
+                    continue
+                m = Member(
+                    username=username,
+                    company_name=company_name,
+                    address=cell(row, 'address'),
+                    business_number=business_number,
+                    corporation_number=cell(row, 'corporation_number'),
+                    representative=cell(row, 'representative'),
+                    phone=cell(row, 'phone'),
+                    mobile=cell(row, 'mobile'),
+                    email=cell(row, 'email'),
+                    approval_status=cell(row, 'approval_status', '승인'),
+                    role=cell(row, 'role', 'member'),
+                )
+                m.set_password(cell(row, 'password', 'temp1234'))
+                db.session.add(m)
+                # 같은 파일 내 중복도 걸러지도록 추가한 값을 집합에 반영
+                usernames.add(username)
+                business_numbers.add(business_number)
+                created += 1
+        finally:
+            wb.close()
         if not safe_commit():
             flash('일괄 업로드 처리 중 오류가 발생했습니다.', 'danger')
         else:
@@ -7370,6 +7535,43 @@ def admin_members_upload():
     return redirect(url_for('admin_members'))
 
 
+def recompute_due_statuses():
+    """상태 전환 시점이 된 신청 건만 SQL로 골라 recompute_status를 적용 (변경이 있을 때만 커밋)
+    
+    recompute_status는 가입시간 기록/포인트 차감 등 부수 효과가 있어 조회식(hybrid)으로 대체할 수 없으므로,
+    전환 조건을 WHERE 절로 옮겨 목록 조회 시 전 행을 재계산/커밋하지 않도록 한다.
+    """
+    now = datetime.now(KST)
+    ia = InsuranceApplication
+    not_ended = db.or_(ia.end_at.is_(None), ia.end_at > now)
+    # SQL에서 NULL != 'x'는 NULL이므로 status가 비어 있는 행도 재계산 대상에 포함
+    not_terminated = db.or_(ia.status.is_(None), ia.status != '종료')
+    not_active = db.or_(ia.status.is_(None), ia.status != '가입')
+    deductible_member = ia.created_by_member_id.in_(
+        db.session.query(Member.id).filter(func.coalesce(Member.settlement_method, '포인트') != '후불정산')
+    )
+    due = db.session.query(ia).options(joinedload(ia.created_by_member)).filter(db.or_(
+        # 승인 후 2시간 경과했으나 가입시간 미기록
+        db.and_(ia.approved_at.is_not(None), ia.start_at.is_(None), ia.approved_at <= now - timedelta(hours=2)),
+        # 가입시간은 있으나 종료시간 미기록
+        db.and_(ia.start_at.is_not(None), ia.end_at.is_(None)),
+        # 종료시간이 지났으나 종료 처리 안 됨
+        db.and_(ia.end_at.is_not(None), ia.end_at <= now, not_terminated),
+        # 가입 기간 중인데 상태가 '가입'이 아니거나 포인트 미차감
+        db.and_(ia.start_at.is_not(None), not_ended, db.or_(
+            not_active,
+            db.and_(ia.point_deducted.is_not(True), deductible_member),
+        )),
+    )).order_by(ia.created_at.desc()).all()
+    
+    changed = False
+    for r in due:
+        if r.recompute_status():
+            changed = True
+    if changed:
+        safe_commit()
+
+
 @app.route('/admin/insurance', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -7381,13 +7583,13 @@ def admin_insurance():
             if db is None:
                 flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
                 return redirect(url_for('admin_insurance'))
-            rows = db.session.query(InsuranceApplication).filter(
-                (InsuranceApplication.approved_at.is_(None))
-            ).all()
-            now = datetime.now(KST)
-            for r in rows:
-                r.approved_at = now
-                r.status = '조합승인'
+            # 행을 로드하지 않고 단일 UPDATE 문으로 처리
+            # (가입시간/종료시간은 승인 2시간 후 recompute_status에서 기록됨)
+            db.session.execute(
+                update(InsuranceApplication)
+                .where(InsuranceApplication.approved_at.is_(None))
+                .values(approved_at=datetime.now(KST), status='조합승인')
+            )
             if not safe_commit():
                 flash('일괄 승인 처리 중 오류가 발생했습니다.', 'danger')
             else:
@@ -7468,68 +7670,60 @@ def admin_insurance():
     if db is None:
         flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
         return redirect(url_for('dashboard'))
-    q = db.session.query(InsuranceApplication)
-    if req_start:
-        q = q.filter(InsuranceApplication.created_at >= datetime.combine(req_start, datetime.min.time(), tzinfo=KST))
-    if req_end:
-        q = q.filter(InsuranceApplication.created_at <= datetime.combine(req_end, datetime.max.time(), tzinfo=KST))
+    # 상태 전환 대상만 재계산 (목록 조회 전에 처리하여 조회 결과가 커밋으로 만료되지 않도록 함)
+    recompute_due_statuses()
+    
+    # 화면에 필요한 컬럼만 조회 (ORM 객체 생성 없이 Row로 받음, 상사명은 OUTER JOIN)
+    q = db.session.query(
+        InsuranceApplication.id,
+        InsuranceApplication.created_at,
+        InsuranceApplication.desired_start_date,
+        InsuranceApplication.start_at,
+        InsuranceApplication.end_at,
+        InsuranceApplication.approved_at,
+        InsuranceApplication.insured_code,
+        InsuranceApplication.contractor_code,
+        InsuranceApplication.car_plate,
+        InsuranceApplication.vin,
+        InsuranceApplication.car_name,
+        InsuranceApplication.car_registered_at,
+        InsuranceApplication.memo,
+        InsuranceApplication.insurance_policy_path,
+        InsuranceApplication.insurance_policy_url,
+        Member.company_name,
+    ).select_from(InsuranceApplication).outerjoin(
+        Member, InsuranceApplication.created_by_member_id == Member.id
+    )
+    req_start_dt, req_end_dt = day_range(req_start, req_end)
+    if req_start_dt:
+        q = q.filter(InsuranceApplication.created_at >= req_start_dt)
+    if req_end_dt:
+        q = q.filter(InsuranceApplication.created_at <= req_end_dt)
     if approved_filter == '승인':
         q = q.filter(InsuranceApplication.approved_at.is_not(None))
     elif approved_filter == '미승인':
         q = q.filter(InsuranceApplication.approved_at.is_(None))
-    if appr_start:
-        q = q.filter(InsuranceApplication.approved_at >= datetime.combine(appr_start, datetime.min.time(), tzinfo=KST))
-    if appr_end:
-        q = q.filter(InsuranceApplication.approved_at <= datetime.combine(appr_end, datetime.max.time(), tzinfo=KST))
+    appr_start_dt, appr_end_dt = day_range(appr_start, appr_end)
+    if appr_start_dt:
+        q = q.filter(InsuranceApplication.approved_at >= appr_start_dt)
+    if appr_end_dt:
+        q = q.filter(InsuranceApplication.approved_at <= appr_end_dt)
 
     rows = q.order_by(InsuranceApplication.created_at.desc()).all()
-    for r in rows:
-        r.recompute_status()
-    safe_commit()  # Status updates - don't show error if it fails
 
     # Build view models with pre-formatted strings to avoid tzlocal usage in templates
-    def fmt_display(dt):
-        if not dt:
-            return ''
-        try:
-            # Ensure timezone-aware datetime and convert to KST
-            if dt.tzinfo is None:
-                # If naive, assume it's already in KST
-                local_dt = dt.replace(tzinfo=KST)
-            else:
-                # Convert to KST
-                local_dt = dt.astimezone(KST)
-            return local_dt.strftime('%Y-%m-%d %H:%M')
-        except Exception:
-            return ''
-
-    def fmt_input(dt):
-        if not dt:
-            return ''
-        try:
-            # Ensure timezone-aware datetime and convert to KST
-            if dt.tzinfo is None:
-                # If naive, assume it's already in KST
-                local_dt = dt.replace(tzinfo=KST)
-            else:
-                # Convert to KST
-                local_dt = dt.astimezone(KST)
-            return local_dt.strftime('%Y-%m-%dT%H:%M')
-        except Exception:
-            return ''
-
     items = []
     for r in rows:
         items.append({
             'id': r.id,
-            'created_by_company': (r.created_by_member.company_name if r.created_by_member else ''),
-            'created_at_str': fmt_display(r.created_at),
+            'created_by_company': r.company_name or '',
+            'created_at_str': fmt_kst_display(r.created_at),
             'desired_start_date': r.desired_start_date,
-            'start_at_str': fmt_display(r.start_at),
-            'end_at_str': fmt_display(r.end_at),
-            'approved_at_str': fmt_display(r.approved_at),
-            'start_at_input': fmt_input(r.start_at),
-            'end_at_input': fmt_input(r.end_at),
+            'start_at_str': fmt_kst_display(r.start_at),
+            'end_at_str': fmt_kst_display(r.end_at),
+            'approved_at_str': fmt_kst_display(r.approved_at),
+            'start_at_input': fmt_kst_input(r.start_at),
+            'end_at_input': fmt_kst_input(r.end_at),
             'insured_code': r.insured_code,
             'contractor_code': r.contractor_code,
             'car_plate': r.car_plate,
@@ -7548,94 +7742,152 @@ def admin_insurance():
 @admin_required
 def admin_insurance_download():
     ensure_initialized()  # Ensure initialization
-    # Import pandas only when needed
-    import pandas as pd
     
     if db is None:
         flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
         return redirect(url_for('admin_insurance'))
-    # Export to Excel
-    rows = db.session.query(InsuranceApplication).order_by(InsuranceApplication.created_at.desc()).all()
-    data = []
-    for r in rows:
-        data.append({
-            '상사명': r.created_by_member.company_name if r.created_by_member else '',
-            '신청시간': r.created_at,
-            '가입희망일자': r.desired_start_date,
-            '가입시간': r.start_at,
-            '종료시간': r.end_at,
-            '조합승인시간': r.approved_at,
-            '피보험자코드': r.insured_code,
-            '계약자코드': r.contractor_code,
-            '한글차량번호': r.car_plate,
-            '차대번호': r.vin,
-            '차량명': r.car_name,
-            '차량등록일자': r.car_registered_at,
-            '보험료': r.premium,
-            '조합승인': '승인' if r.approved_at else '미승인',
-            '비고': r.memo or '',
-        })
-    df = pd.DataFrame(data)
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='data')
-    buffer.seek(0)
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name='insurance_data.xlsx',
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    # Export to Excel (DataFrame 없이 조회 결과를 행 단위로 기록)
+    rows = (
+        db.session.query(InsuranceApplication)
+        .options(joinedload(InsuranceApplication.created_by_member))
+        .order_by(InsuranceApplication.created_at.desc())
+        .yield_per(500)
     )
+    headers = ['상사명', '신청시간', '가입희망일자', '가입시간', '종료시간', '조합승인시간',
+               '피보험자코드', '계약자코드', '한글차량번호', '차대번호', '차량명', '차량등록일자',
+               '보험료', '조합승인', '비고']
+    return send_xlsx('data', headers, (
+        (
+            r.created_by_member.company_name if r.created_by_member else '',
+            r.created_at,
+            r.desired_start_date,
+            r.start_at,
+            r.end_at,
+            r.approved_at,
+            r.insured_code,
+            r.contractor_code,
+            r.car_plate,
+            r.vin,
+            r.car_name,
+            r.car_registered_at,
+            r.premium,
+            '승인' if r.approved_at else '미승인',
+            r.memo or '',
+        )
+        for r in rows
+    ), 'insurance_data.xlsx')
 
 
-@app.route('/admin/settlement')
-@login_required
-@admin_required
-def admin_settlement():
-    ensure_initialized()  # Ensure initialization
-    year = int(request.args.get('year', datetime.now().year))
-    month = int(request.args.get('month', datetime.now().month))
+# 월별 상사 정산 집계 캐시 - 프로세스 내, 60초 TTL
+_COMPANY_AGG_TTL = 60
+_company_agg_cache = {}
+# 무효화될 때마다 증가 - 무효화 전에 시작된 집계 결과가 무효화 후에 저장되는 것을 막음
+_company_agg_generation = [0]
+
+
+def _company_month_aggregates(year, month):
+    """해당 년/월(가입시간 기준) 상사별 (상사명, 대표자, 사업자번호, 정산방법, 건수) 목록
+    
+    정산 화면, 정산 엑셀, 청구서 일괄 출력이 같은 집계를 사용한다.
+    신청/회원 변경(flush 또는 벌크 UPDATE/DELETE)이 포함된 트랜잭션이 커밋되거나 롤백되면 즉시 무효화된다.
+    """
+    key = (year, month)
+    now = monotonic()
+    cached = _company_agg_cache.get(key)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    generation = _company_agg_generation[0]
 
-    # 기준: 책임보험 승인페이지에서 해당 년/월 데이터 (시작일 기준)
     start_period = datetime(year, month, 1, tzinfo=KST)
     if month == 12:
         next_month = datetime(year + 1, 1, 1, tzinfo=KST)
     else:
         next_month = datetime(year, month + 1, 1, tzinfo=KST)
 
-    if db is None:
-        flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
-        return redirect(url_for('admin_settlement'))
-    rows = db.session.query(InsuranceApplication).filter(
+    # 상사별 건수를 DB에서 GROUP BY로 집계 (작성 회원이 없는 신청은 '미상'으로 표시)
+    agg = db.session.query(
+        Member.company_name,
+        Member.representative,
+        Member.business_number,
+        func.max(Member.settlement_method),
+        func.count(InsuranceApplication.id),
+    ).select_from(InsuranceApplication).outerjoin(
+        Member, InsuranceApplication.created_by_member_id == Member.id
+    ).filter(
         InsuranceApplication.start_at.is_not(None),
         InsuranceApplication.start_at >= start_period,
         InsuranceApplication.start_at < next_month,
+    ).group_by(
+        Member.company_name, Member.representative, Member.business_number
+    ).order_by(
+        Member.company_name, Member.representative, Member.business_number
     ).all()
 
-    # 그룹핑: 상사별 건수/금액
-    by_company = {}
-    for r in rows:
-        company = r.created_by_member.company_name if r.created_by_member else '미상'
-        rep = r.created_by_member.representative if r.created_by_member else ''
-        biz = r.created_by_member.business_number if r.created_by_member else ''
-        settlement_method = (r.created_by_member.settlement_method if r.created_by_member else '포인트') or '포인트'
-        key = (company, rep, biz)
-        if key not in by_company:
-            by_company[key] = {
-                'count': 0,
-                'amount': 0,
-                'settlement_method': settlement_method
-            }
-        else:
-            if not by_company[key].get('settlement_method'):
-                by_company[key]['settlement_method'] = settlement_method
-        by_company[key]['count'] += 1
+    value = [
+        (company or '미상', rep or '', biz or '', settlement_method or '포인트', count)
+        for company, rep, biz, settlement_method, count in agg
+    ]
+    if generation == _company_agg_generation[0]:
+        _company_agg_cache[key] = (now + _COMPANY_AGG_TTL, value)
+    return value
+
+
+def _clear_company_aggregates():
+    _company_agg_generation[0] += 1
+    _company_agg_cache.clear()
+
+
+# flush 시점에는 아직 커밋 전이라 다른 요청이 이전 데이터로 캐시를 다시 채울 수 있으므로,
+# 변경 여부만 세션에 표시해 두고 실제 무효화는 커밋/롤백 후에 수행
+@event.listens_for(Session, 'after_flush')
+def _mark_company_aggregates_dirty(session, flush_context):
+    if session.info.get('company_agg_dirty'):
+        return
+    tracked = tuple(c for c in (globals().get('InsuranceApplication'), globals().get('Member')) if isinstance(c, type))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, tracked):
+            session.info['company_agg_dirty'] = True
+            return
+
 
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_company_aggregates_dirty_on_bulk(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['company_agg_dirty'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_company_aggregates_on_commit(session):
+    if session.info.pop('company_agg_dirty', False):
+        _clear_company_aggregates()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _invalidate_company_aggregates_on_rollback(session, previous_transaction):
+    # 같은 세션에서 flush 후 채운 캐시에는 롤백된 데이터가 들어 있을 수 있음
+    if session.info.get('company_agg_dirty'):
+        _clear_company_aggregates()
+        if not session.in_transaction():
+            session.info.pop('company_agg_dirty', None)
+
+
+@app.route('/admin/settlement')
+@login_required
+@admin_required
+def admin_settlement():
+    ensure_initialized()  # Ensure initialization
+    year = int(request.args.get('year', datetime.now().year))
+    month = int(request.args.get('month', datetime.now().month))
+
+    if db is None:
+        flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
+        return redirect(url_for('admin_settlement'))
+
+    # 기준: 책임보험 승인페이지에서 해당 년/월 데이터 (시작일 기준)
     settlements = []
     total_count = 0
     total_amount = 0
-    for (company, rep, biz), data in by_company.items():
-        count = data['count']
+    for company, rep, biz, settlement_method, count in _company_month_aggregates(year, month):
         amount = count * 9500
         total_count += count
         total_amount += amount
@@ -7645,7 +7897,7 @@ def admin_settlement():
             'business_number': biz,
             'count': count,
             'amount': amount,
-            'settlement_method': data.get('settlement_method', '포인트'),
+            'settlement_method': settlement_method,
         })
 
     # Ensure total_count and total_amount are always integers (not None)
@@ -7666,8 +7918,6 @@ def admin_settlement():
 def admin_settlement_export():
     """정산 결과를 엑셀로 다운로드"""
     ensure_initialized()
-    import pandas as pd
-    from io import BytesIO
     
     try:
         year = int(request.args.get('year', datetime.now().year))
@@ -7688,88 +7938,24 @@ def admin_settlement_export():
         flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
         return redirect(url_for('admin_settlement'))
     
-    # 정산 데이터 계산 (admin_settlement와 동일한 로직)
-    start_period = datetime(year, month, 1, tzinfo=KST)
-    if month == 12:
-        next_month = datetime(year + 1, 1, 1, tzinfo=KST)
-    else:
-        next_month = datetime(year, month + 1, 1, tzinfo=KST)
-    
-    rows = db.session.query(InsuranceApplication).filter(
-        InsuranceApplication.start_at.is_not(None),
-        InsuranceApplication.start_at >= start_period,
-        InsuranceApplication.start_at < next_month,
-    ).all()
-    
-    # 그룹핑: 상사별 건수/금액
-    by_company = {}
-    for r in rows:
-        company = r.created_by_member.company_name if r.created_by_member else '미상'
-        rep = r.created_by_member.representative if r.created_by_member else ''
-        biz = r.created_by_member.business_number if r.created_by_member else ''
-        settlement_method = (r.created_by_member.settlement_method if r.created_by_member else '포인트') or '포인트'
-        key = (company, rep, biz)
-        if key not in by_company:
-            by_company[key] = {
-                'count': 0,
-                'settlement_method': settlement_method
-            }
-        else:
-            if not by_company[key].get('settlement_method'):
-                by_company[key]['settlement_method'] = settlement_method
-        by_company[key]['count'] += 1
-    
-    # 엑셀 데이터 생성
+    # 엑셀 데이터 생성 (admin_settlement와 동일한 집계)
     data = []
-    row_num = 1
     total_count = 0
     total_amount = 0
     
-    for (company, rep, biz), info in sorted(by_company.items()):
-        count = info['count']
+    for row_num, (company, rep, biz, settlement_method, count) in enumerate(_company_month_aggregates(year, month), 1):
         amount = count * 9500
         total_count += count
         total_amount += amount
-        
-        data.append({
-            '순번': row_num,
-            '상사명': company,
-            '대금정산방법': info.get('settlement_method', '포인트'),
-            '대표자': rep,
-            '사업자번호': biz,
-            '건수': count,
-            '금액': amount,
-            '비고': '',
-        })
-        row_num += 1
+        data.append((row_num, company, settlement_method, rep, biz, count, amount, ''))
     
     # 합계 행 추가
     if data:
-        data.append({
-            '순번': '',
-            '상사명': '합계',
-            '대금정산방법': '',
-            '대표자': '',
-            '사업자번호': '',
-            '건수': total_count,
-            '금액': total_amount,
-            '비고': '',
-        })
-    
-    # DataFrame 생성 및 엑셀 파일 생성
-    df = pd.DataFrame(data)
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='정산내역')
-    buffer.seek(0)
+        data.append(('', '합계', '', '', '', total_count, total_amount, ''))
     
+    headers = ['순번', '상사명', '대금정산방법', '대표자', '사업자번호', '건수', '금액', '비고']
     filename = f'정산내역_{year}년{month}월_{datetime.now(KST).strftime("%Y%m%d_%H%M%S")}.xlsx'
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name=filename,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-    )
+    return send_xlsx('정산내역', headers, data, filename)
 
 
 @app.route('/admin/invoice')
@@ -7807,32 +7993,12 @@ def admin_invoice_batch():
     year = int(request.args.get('year', datetime.now().year))
     month = int(request.args.get('month', datetime.now().month))
 
-    start_period = datetime(year, month, 1, tzinfo=KST)
-    if month == 12:
-        next_month = datetime(year + 1, 1, 1, tzinfo=KST)
-    else:
-        next_month = datetime(year, month + 1, 1, tzinfo=KST)
-
     if db is None:
         flash('데이터베이스가 초기화되지 않았습니다.', 'danger')
         return redirect(url_for('admin_settlement'))
-    rows = db.session.query(InsuranceApplication).filter(
-        InsuranceApplication.start_at.is_not(None),
-        InsuranceApplication.start_at >= start_period,
-        InsuranceApplication.start_at < next_month,
-    ).all()
-
-    by_company = {}
-    for r in rows:
-        company = r.created_by_member.company_name if r.created_by_member else '미상'
-        rep = r.created_by_member.representative if r.created_by_member else ''
-        biz = r.created_by_member.business_number if r.created_by_member else ''
-        key = (company, rep, biz)
-        by_company.setdefault(key, 0)
-        by_company[key] += 1
 
     invoices = []
-    for (company, rep, biz), count in by_company.items():
+    for company, rep, biz, _settlement_method, count in _company_month_aggregates(year, month):
         amount = count * 9500
         invoices.append({
             'company': company,
@@ -7846,6 +8012,22 @@ def admin_invoice_batch():
     return render_template('invoice_batch.html', invoices=invoices)
 
 
+# 오류 처리 시 리다이렉트 경로 캐시 (최초 사용 시 실제 요청 컨텍스트에서 한 번만 URL 맵 조회)
+_ERROR_REDIRECT_FALLBACKS = {'login': '/login', 'dashboard': '/dashboard'}
+_error_redirect_urls = {}
+
+
+def _error_redirect_url(endpoint):
+    url = _error_redirect_urls.get(endpoint)
+    if url is None:
+        try:
+            url = url_for(endpoint)
+        except Exception:
+            url = _ERROR_REDIRECT_FALLBACKS[endpoint]
+        _error_redirect_urls[endpoint] = url
+    return url
+
+
 @app.errorhandler(Exception)
 def handle_unexpected_error(e):
     """Handle all unhandled exceptions with detailed logging"""
@@ -7853,78 +8035,48 @@ def handle_unexpected_error(e):
     if isinstance(e, HTTPException):
         return e
     
-    # Log full stack trace for debugging
-    import traceback
-    error_trace = traceback.format_exc()
     error_msg = str(e)
     error_type = type(e).__name__
     
-    # Log to stderr for Vercel (more reliable than app.logger)
-    try:
-        import sys
+    # 클라이언트가 연결을 끊은 경우는 응답을 받을 대상이 없으므로 한 줄만 남기고 종료 (디버그 모드 제외)
+    if not app.debug and isinstance(e, (BrokenPipeError, ConnectionResetError)):
+        with suppress(Exception):
+            sys.stderr.write(f"Client disconnected: {error_type}: {error_msg}\n")
+        return ("", 500)
+    
+    # Log full stack trace to stderr for Vercel (more reliable than app.logger)
+    # 전체 트레이스백을 하나의 문자열로 만들지 않고 줄 단위로 바로 기록
+    with suppress(Exception):
         sys.stderr.write(f"\n{'='*60}\n")
         sys.stderr.write(f"UNHANDLED EXCEPTION: {error_type}\n")
         sys.stderr.write(f"Error Message: {error_msg}\n")
-        sys.stderr.write(f"Traceback:\n{error_trace}\n")
+        sys.stderr.write("Traceback:\n")
+        for line in traceback.TracebackException.from_exception(e).format():
+            sys.stderr.write(line)
         sys.stderr.write(f"{'='*60}\n")
-    except Exception:
-        pass
     
     # Also log via Flask logger if available
-    try:
+    with suppress(Exception):
         app.logger.exception("Unhandled exception")
-    except Exception:
-        pass
     
-    # Try to provide user-friendly error message
-    try:
-        from flask import request, has_request_context
-        
-        if has_request_context():
-            # Only flash if we're in a request context
-            try:
-                flash('서버 처리 중 오류가 발생했습니다.', 'danger')
-            except Exception:
-                pass
-            
-            # Try to redirect appropriately
-            try:
-                # Check authentication status safely
-                is_auth = False
-                try:
-                    from flask_login import current_user
-                    is_auth = getattr(current_user, 'is_authenticated', False)
-                except Exception:
-                    pass
-                
-                if not is_auth:
-                    try:
-                        return redirect(url_for('login'))
-                    except Exception:
-                        pass
-                else:
-                    try:
-                        return redirect(url_for('dashboard'))
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-        
-        # If redirect failed, show error page
-        try:
-            from flask import render_template
-            return render_template('error.html', error_message=error_msg), 500
-        except Exception:
-            pass
-        
-    except Exception:
-        pass
+    # Try to provide user-friendly error message and redirect appropriately
+    if has_request_context():
+        with suppress(Exception):
+            flash('서버 처리 중 오류가 발생했습니다.', 'danger')
+        
+        # Check authentication status safely (확인 실패 시 로그인 페이지로)
+        is_auth = False
+        with suppress(Exception):
+            is_auth = getattr(current_user, 'is_authenticated', False)
+        with suppress(Exception):
+            return redirect(_error_redirect_url('dashboard' if is_auth else 'login'))
+    
+    # If redirect failed, show error page
+    with suppress(Exception):
+        return render_template('error.html', error_message=error_msg), 500
     
     # Ultimate fallback: return minimal error response
-    try:
-        return f"<h1>서버 오류</h1><p>오류가 발생했습니다: {error_type}</p>", 500
-    except Exception:
-        return ("서버 오류가 발생했습니다.", 500)
+    return f"<h1>서버 오류</h1><p>오류가 발생했습니다: {error_type}</p>", 500
 
 
 if __name__ == '__main__':
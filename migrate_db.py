@@ -8,6 +8,272 @@ import sqlite3
 import os
 from datetime import datetime
 
+# 기존 테이블에 없으면 추가할 컬럼 (테이블, 컬럼명, 정의)
+COLUMN_ADDITIONS = [
+    ('member', 'partner_group_id', 'INTEGER'),
+    ('member', 'role', "VARCHAR(32) DEFAULT 'member'"),
+    ('member', 'member_type', "VARCHAR(32) DEFAULT '법인'"),
+    ('member', 'privacy_agreement', 'BOOLEAN DEFAULT 0'),
+    ('member', 'settlement_method', "VARCHAR(16) DEFAULT '포인트'"),
+    ('member', 'point_balance', 'INTEGER DEFAULT 0'),
+    ('insurance_application', 'partner_group_id', 'INTEGER'),
+    ('insurance_application', 'insurance_policy_path', 'VARCHAR(512)'),
+    ('insurance_application', 'insurance_policy_url', 'VARCHAR(512)'),
+    ('insurance_application', 'point_deducted', 'BOOLEAN DEFAULT 0'),
+    ('deposit_request', 'account_holder', "VARCHAR(128) NOT NULL DEFAULT ''"),
+    ('deposit_request', 'bank_name', "VARCHAR(128) NOT NULL DEFAULT ''"),
+]
+
+
+# 1. PartnerGroup 테이블
+PARTNER_GROUP_DDL = """
+    CREATE TABLE IF NOT EXISTS partner_group (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        admin_username VARCHAR(120) NOT NULL UNIQUE,
+        admin_password_hash VARCHAR(255) NOT NULL,
+        business_number VARCHAR(64) NOT NULL UNIQUE,
+        representative VARCHAR(128) NOT NULL,
+        phone VARCHAR(64) NOT NULL,
+        mobile VARCHAR(64),
+        address VARCHAR(255),
+        bank_name VARCHAR(128),
+        account_number VARCHAR(128),
+        registration_cert_path VARCHAR(512),
+        logo_path VARCHAR(512),
+        memo VARCHAR(255),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+# 4. 포인트 관리 관련 테이블
+POINT_TABLES_DDL = """
+    CREATE TABLE IF NOT EXISTS deposit_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_id INTEGER NOT NULL,
+        partner_group_id INTEGER NOT NULL,
+        bank_name VARCHAR(128) NOT NULL,
+        account_number VARCHAR(128) NOT NULL,
+        deposit_amount INTEGER NOT NULL,
+        deposit_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (member_id) REFERENCES member(id),
+        FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS deposit_request (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_id INTEGER NOT NULL,
+        partner_group_id INTEGER NOT NULL,
+        amount INTEGER NOT NULL,
+        account_holder VARCHAR(128) NOT NULL DEFAULT '',
+        bank_name VARCHAR(128) NOT NULL DEFAULT '',
+        status VARCHAR(32) DEFAULT 'requested',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        confirmed_at DATETIME,
+        FOREIGN KEY (member_id) REFERENCES member(id),
+        FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS virtual_account (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_id INTEGER NOT NULL,
+        partner_group_id INTEGER NOT NULL,
+        account_holder VARCHAR(128) NOT NULL,
+        bank_name VARCHAR(128) NOT NULL,
+        virtual_account_number VARCHAR(128) NOT NULL UNIQUE,
+        deposit_amount INTEGER NOT NULL,
+        expiry_date DATE NOT NULL,
+        status VARCHAR(32) DEFAULT '대기',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (member_id) REFERENCES member(id),
+        FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS point_adjustment (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_id INTEGER NOT NULL,
+        partner_group_id INTEGER NOT NULL,
+        decrease_amount INTEGER DEFAULT 0,
+        increase_amount INTEGER DEFAULT 0,
+        change_amount INTEGER DEFAULT 0,
+        note VARCHAR(255),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (member_id) REFERENCES member(id),
+        FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
+    );
+"""
+
+
+# 7. 외래키(파트너그룹/회원) 조회용 인덱스 - app.py 모델의 인덱스 이름과 동일하게 유지
+FOREIGN_KEY_INDEXES = [
+    ('idx_member_partner_group', 'member', 'partner_group_id'),
+    ('idx_member_username_partner', 'member', 'username, partner_group_id'),
+    ('idx_ins_app_partner_group', 'insurance_application', 'partner_group_id'),
+    ('idx_ins_app_created_by', 'insurance_application', 'created_by_member_id'),
+    ('idx_deposit_history_partner_group', 'deposit_history', 'partner_group_id'),
+    ('idx_deposit_history_member', 'deposit_history', 'member_id'),
+    ('idx_deposit_request_partner_group', 'deposit_request', 'partner_group_id'),
+    ('idx_deposit_request_member', 'deposit_request', 'member_id'),
+    ('idx_virtual_account_partner_group', 'virtual_account', 'partner_group_id'),
+    ('idx_virtual_account_member', 'virtual_account', 'member_id'),
+    ('idx_point_adjustment_partner_group', 'point_adjustment', 'partner_group_id'),
+    ('idx_point_adjustment_member', 'point_adjustment', 'member_id'),
+]
+
+
+def add_missing_columns(cursor, table):
+    """COLUMN_ADDITIONS 중 table에 아직 없는 컬럼만 추가하고 추가한 컬럼명 목록을 반환 (테이블당 조회 1회)"""
+    cursor.execute("SELECT name FROM pragma_table_info(?)", (table,))
+    existing = {row[0] for row in cursor.fetchall()}
+    added = []
+    for column_table, name, ddl in COLUMN_ADDITIONS:
+        if column_table == table and name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+            added.append(name)
+    return added
+
+
+def _mig_2_add_member_columns(cursor, passwords):
+    """2. Member 테이블에 새 컬럼 추가"""
+    print("👥 Member 테이블 업데이트 중...")
+    for name in add_missing_columns(cursor, 'member'):
+        print(f"  ✅ {name} 컬럼 추가됨")
+
+
+def _mig_3_add_insurance_application_columns(cursor, passwords):
+    """3. InsuranceApplication 테이블에 새 컬럼 추가"""
+    print("📄 InsuranceApplication 테이블 업데이트 중...")
+    for name in add_missing_columns(cursor, 'insurance_application'):
+        print(f"  ✅ {name} 컬럼 추가됨")
+
+
+def _mig_4_add_deposit_request_columns(cursor, passwords):
+    """4. 포인트 관리 테이블 보완 (기존 deposit_request 테이블에 account_holder, bank_name 컬럼 추가)"""
+    print("💳 포인트 관리 테이블 업데이트 중...")
+    try:
+        for name in add_missing_columns(cursor, 'deposit_request'):
+            print(f"  ✅ deposit_request.{name} 컬럼 추가됨")
+    except Exception as e:
+        print(f"  ⚠️ deposit_request 컬럼 추가 중 오류 (무시 가능): {e}")
+
+
+def _mig_5_update_admin_account(cursor, passwords):
+    """5. 기존 관리자 계정 업데이트"""
+    print("🔐 기존 관리자 계정 업데이트 중...")
+    
+    # 기존 admin 계정을 hyundai로 변경하고 role 설정 + 전체관리자 비밀번호 갱신을 한 번의 UPDATE로 처리
+    # (SET 절의 CASE는 갱신 전 값을 기준으로 평가됨)
+    cursor.execute("""
+        UPDATE member 
+        SET username = CASE WHEN username = 'admin' OR role IS NULL THEN 'hyundai' ELSE username END, 
+            role = CASE WHEN username = 'admin' OR role IS NULL THEN 'admin' ELSE role END,
+            partner_group_id = CASE WHEN username = 'admin' OR role IS NULL THEN NULL ELSE partner_group_id END,
+            company_name = CASE WHEN username = 'admin' OR role IS NULL THEN '현대해상30일책임보험전산' ELSE company_name END,
+            representative = CASE WHEN username = 'admin' OR role IS NULL THEN '전체관리자' ELSE representative END,
+            password_hash = ?
+        WHERE username = 'admin' OR role IS NULL OR (username = 'hyundai' AND role = 'admin')
+    """, (passwords['admin'],))
+    
+    print("  ✅ 관리자 계정 업데이트 완료 (ID: hyundai, PW: #admin1004)")
+
+
+def _mig_6_assign_default_partner_group(cursor, passwords):
+    """6. 기존 회원들에게 기본 파트너그룹 생성 및 할당"""
+    print("🏢 기본 파트너그룹 생성 중...")
+    
+    default_group = (
+        '부산자동차매매사업자조합',
+        'busan_admin',
+        passwords['partner_group'],
+        '123-45-67890',
+        '조합장',
+        '051-123-4567',
+        '부산광역시'
+    )
+    
+    default_group_id = None
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        # 기본 파트너그룹 생성 및 ID 조회를 RETURNING으로 한 번에 처리
+        # (이미 있으면 name을 자기 자신으로 갱신해 기존 행의 id를 돌려받음)
+        try:
+            cursor.execute("""
+                INSERT INTO partner_group 
+                (name, admin_username, admin_password_hash, business_number, representative, phone, address)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET name = excluded.name
+                RETURNING id
+            """, default_group)
+            default_group_id = cursor.fetchone()[0]
+        except sqlite3.IntegrityError:
+            # ON CONFLICT(name)은 admin_username/business_number 충돌을 처리하지 않으므로
+            # 기존과 같이 INSERT OR IGNORE 경로로 처리 (실패한 문장만 취소되고 트랜잭션은 유지됨)
+            pass
+    
+    if default_group_id is None:
+        # RETURNING 미지원 SQLite 또는 다른 UNIQUE 컬럼 충돌: 기존 방식대로 생성 후 ID 조회
+        cursor.execute("""
+            INSERT OR IGNORE INTO partner_group 
+            (name, admin_username, admin_password_hash, business_number, representative, phone, address)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, default_group)
+        cursor.execute("SELECT id FROM partner_group WHERE name = ?", (default_group[0],))
+        default_group_id = cursor.fetchone()[0]
+    
+    # 7단계의 partner_group_id 인덱스를 미리 생성해 아래 두 UPDATE가 전체 스캔 대신 NULL 행만 인덱스로 찾도록 함
+    # (임시 부분 인덱스는 만들 때 어차피 전체 스캔이 필요하므로, 계속 사용할 인덱스를 앞당겨 만드는 편이 이득)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_member_partner_group ON member (partner_group_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ins_app_partner_group ON insurance_application (partner_group_id)")
+    
+    # 기존 회원들을 기본 파트너그룹에 할당
+    cursor.execute("""
+        UPDATE member 
+        SET partner_group_id = ?
+        WHERE role != 'admin' AND partner_group_id IS NULL
+    """, (default_group_id,))
+    
+    # 기존 보험 신청들을 기본 파트너그룹에 할당
+    cursor.execute("""
+        UPDATE insurance_application 
+        SET partner_group_id = ?
+        WHERE partner_group_id IS NULL
+    """, (default_group_id,))
+    
+    print(f"  ✅ 기본 파트너그룹 생성 및 할당 완료 (ID: {default_group_id})")
+
+
+def _mig_7_create_foreign_key_indexes(cursor, passwords):
+    """7. 외래키 컬럼 인덱스 생성 (2, 3단계에서 컬럼이 추가된 뒤 실행)"""
+    print("🗂️ 인덱스 생성 중...")
+    for index_name, table, columns in FOREIGN_KEY_INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})")
+    print(f"  ✅ 인덱스 {len(FOREIGN_KEY_INDEXES)}개 확인/생성 완료")
+
+
+# 순서대로 실행되는 마이그레이션 단계 (CREATE TABLE DDL, 함수). 완료된 단계 번호는 PRAGMA user_version에 기록되며,
+# 새 단계는 반드시 목록 끝에 추가해야 한다 (기존 번호가 바뀌면 이미 적용된 DB에서 단계가 건너뛰어짐).
+# DDL은 모두 IF NOT EXISTS이며, 남은 단계의 DDL을 트랜잭션 시작과 함께 한 번의 executescript로 실행한다.
+MIGRATION_STEPS = [
+    (PARTNER_GROUP_DDL, None),
+    (None, _mig_2_add_member_columns),
+    (None, _mig_3_add_insurance_application_columns),
+    (POINT_TABLES_DDL, _mig_4_add_deposit_request_columns),
+    (None, _mig_5_update_admin_account),
+    (None, _mig_6_assign_default_partner_group),
+    (None, _mig_7_create_foreign_key_indexes),
+]
+SCHEMA_VERSION = len(MIGRATION_STEPS)
+
+
+def get_schema_version(db_path):
+    """DB 헤더의 user_version (적용 완료된 마이그레이션 단계 번호)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
 def migrate_database():
     """데이터베이스 스키마를 마이그레이션합니다."""
     
@@ -18,263 +284,94 @@ def migrate_database():
         print("❌ 데이터베이스 파일이 존재하지 않습니다.")
         return False
     
-    # 백업 생성
+    # 이미 최신 버전이면 백업/스키마 조회 없이 바로 종료
+    try:
+        start_version = get_schema_version(db_path)
+        if start_version >= SCHEMA_VERSION:
+            print(f"✅ 이미 최신 스키마입니다. (user_version={SCHEMA_VERSION})")
+            return True
+    except sqlite3.Error as e:
+        print(f"❌ 데이터베이스 버전 확인 실패: {e}")
+        return False
+    
+    # 백업 생성 (SQLite 백업 API로 페이지 단위 복사 - 외부 프로세스 없이 WAL 내용까지 일관된 스냅샷)
     backup_path = f"data/busan_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-    os.system(f"cp {db_path} {backup_path}")
+    try:
+        source = sqlite3.connect(db_path)
+        try:
+            target = sqlite3.connect(backup_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+    except sqlite3.Error as e:
+        print(f"❌ 데이터베이스 백업 실패: {e}")
+        return False
     print(f"✅ 데이터베이스 백업 생성: {backup_path}")
     
+    conn = None
     try:
-        conn = sqlite3.connect(db_path)
+        # 자동 트랜잭션을 끄고 전체 마이그레이션을 하나의 트랜잭션으로 직접 관리
+        conn = sqlite3.connect(db_path, isolation_level=None)
         cursor = conn.cursor()
         
-        print("🔄 데이터베이스 스키마 마이그레이션 시작...")
-        
-        # 1. PartnerGroup 테이블 생성
-        print("📋 PartnerGroup 테이블 생성 중...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS partner_group (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name VARCHAR(255) NOT NULL UNIQUE,
-                admin_username VARCHAR(120) NOT NULL UNIQUE,
-                admin_password_hash VARCHAR(255) NOT NULL,
-                business_number VARCHAR(64) NOT NULL UNIQUE,
-                representative VARCHAR(128) NOT NULL,
-                phone VARCHAR(64) NOT NULL,
-                mobile VARCHAR(64),
-                address VARCHAR(255),
-                bank_name VARCHAR(128),
-                account_number VARCHAR(128),
-                registration_cert_path VARCHAR(512),
-                logo_path VARCHAR(512),
-                memo VARCHAR(255),
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # 2. Member 테이블에 새 컬럼 추가
-        print("👥 Member 테이블 업데이트 중...")
-        
-        # 기존 컬럼 확인
-        cursor.execute("PRAGMA table_info(member)")
-        existing_columns = [column[1] for column in cursor.fetchall()]
-        
-        # partner_group_id 컬럼 추가
-        if 'partner_group_id' not in existing_columns:
-            cursor.execute("ALTER TABLE member ADD COLUMN partner_group_id INTEGER")
-            print("  ✅ partner_group_id 컬럼 추가됨")
-        
-        # role 컬럼 추가
-        if 'role' not in existing_columns:
-            cursor.execute("ALTER TABLE member ADD COLUMN role VARCHAR(32) DEFAULT 'member'")
-            print("  ✅ role 컬럼 추가됨")
-        
-        # member_type 컬럼 추가
-        if 'member_type' not in existing_columns:
-            cursor.execute("ALTER TABLE member ADD COLUMN member_type VARCHAR(32) DEFAULT '법인'")
-            print("  ✅ member_type 컬럼 추가됨")
-        
-        # privacy_agreement 컬럼 추가
-        if 'privacy_agreement' not in existing_columns:
-            cursor.execute("ALTER TABLE member ADD COLUMN privacy_agreement BOOLEAN DEFAULT 0")
-            print("  ✅ privacy_agreement 컬럼 추가됨")
-
-        # settlement_method 컬럼 추가
-        if 'settlement_method' not in existing_columns:
-            cursor.execute("ALTER TABLE member ADD COLUMN settlement_method VARCHAR(16) DEFAULT '포인트'")
-            print("  ✅ settlement_method 컬럼 추가됨")
-        
-        # point_balance 컬럼 추가
-        if 'point_balance' not in existing_columns:
-            cursor.execute("ALTER TABLE member ADD COLUMN point_balance INTEGER DEFAULT 0")
-            print("  ✅ point_balance 컬럼 추가됨")
-        
-        # 3. InsuranceApplication 테이블에 새 컬럼 추가
-        print("📄 InsuranceApplication 테이블 업데이트 중...")
-        
-        cursor.execute("PRAGMA table_info(insurance_application)")
-        existing_columns = [column[1] for column in cursor.fetchall()]
-        
-        # partner_group_id 컬럼 추가
-        if 'partner_group_id' not in existing_columns:
-            cursor.execute("ALTER TABLE insurance_application ADD COLUMN partner_group_id INTEGER")
-            print("  ✅ partner_group_id 컬럼 추가됨")
-        
-        # insurance_policy_path 컬럼 추가
-        if 'insurance_policy_path' not in existing_columns:
-            cursor.execute("ALTER TABLE insurance_application ADD COLUMN insurance_policy_path VARCHAR(512)")
-            print("  ✅ insurance_policy_path 컬럼 추가됨")
-        
-        # insurance_policy_url 컬럼 추가
-        if 'insurance_policy_url' not in existing_columns:
-            cursor.execute("ALTER TABLE insurance_application ADD COLUMN insurance_policy_url VARCHAR(512)")
-            print("  ✅ insurance_policy_url 컬럼 추가됨")
-        
-        if 'point_deducted' not in existing_columns:
-            cursor.execute("ALTER TABLE insurance_application ADD COLUMN point_deducted BOOLEAN DEFAULT 0")
-            print("  ✅ point_deducted 컬럼 추가됨")
-
-        # 4. 포인트 관리 관련 테이블 생성
-        print("💳 포인트 관리 테이블 생성 중...")
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS deposit_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                member_id INTEGER NOT NULL,
-                partner_group_id INTEGER NOT NULL,
-                bank_name VARCHAR(128) NOT NULL,
-                account_number VARCHAR(128) NOT NULL,
-                deposit_amount INTEGER NOT NULL,
-                deposit_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (member_id) REFERENCES member(id),
-                FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
-            )
-        """)
-        print("  ✅ deposit_history 테이블 확인/생성 완료")
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS deposit_request (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                member_id INTEGER NOT NULL,
-                partner_group_id INTEGER NOT NULL,
-                amount INTEGER NOT NULL,
-                account_holder VARCHAR(128) NOT NULL DEFAULT '',
-                bank_name VARCHAR(128) NOT NULL DEFAULT '',
-                status VARCHAR(32) DEFAULT 'requested',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                confirmed_at DATETIME,
-                FOREIGN KEY (member_id) REFERENCES member(id),
-                FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
-            )
-        """)
-        print("  ✅ deposit_request 테이블 확인/생성 완료")
-        
-        # deposit_request 테이블에 account_holder, bank_name 컬럼 추가 (기존 테이블이 있는 경우)
-        try:
-            cursor.execute("PRAGMA table_info(deposit_request)")
-            existing_columns = [row[1] for row in cursor.fetchall()]
-            
-            if 'account_holder' not in existing_columns:
-                cursor.execute("ALTER TABLE deposit_request ADD COLUMN account_holder VARCHAR(128) NOT NULL DEFAULT ''")
-                print("  ✅ deposit_request.account_holder 컬럼 추가됨")
-            
-            if 'bank_name' not in existing_columns:
-                cursor.execute("ALTER TABLE deposit_request ADD COLUMN bank_name VARCHAR(128) NOT NULL DEFAULT ''")
-                print("  ✅ deposit_request.bank_name 컬럼 추가됨")
-        except Exception as e:
-            print(f"  ⚠️ deposit_request 컬럼 추가 중 오류 (무시 가능): {e}")
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS virtual_account (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                member_id INTEGER NOT NULL,
-                partner_group_id INTEGER NOT NULL,
-                account_holder VARCHAR(128) NOT NULL,
-                bank_name VARCHAR(128) NOT NULL,
-                virtual_account_number VARCHAR(128) NOT NULL UNIQUE,
-                deposit_amount INTEGER NOT NULL,
-                expiry_date DATE NOT NULL,
-                status VARCHAR(32) DEFAULT '대기',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (member_id) REFERENCES member(id),
-                FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
-            )
-        """)
-        print("  ✅ virtual_account 테이블 확인/생성 완료")
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS point_adjustment (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                member_id INTEGER NOT NULL,
-                partner_group_id INTEGER NOT NULL,
-                decrease_amount INTEGER DEFAULT 0,
-                increase_amount INTEGER DEFAULT 0,
-                change_amount INTEGER DEFAULT 0,
-                note VARCHAR(255),
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (member_id) REFERENCES member(id),
-                FOREIGN KEY (partner_group_id) REFERENCES partner_group(id)
-            )
-        """)
-        print("  ✅ point_adjustment 테이블 확인/생성 완료")
-        
-        # 5. 기존 관리자 계정 업데이트
-        print("🔐 기존 관리자 계정 업데이트 중...")
-        
-        # 기존 admin 계정을 hyundai로 변경하고 role 설정
-        cursor.execute("""
-            UPDATE member 
-            SET username = 'hyundai', 
-                role = 'admin',
-                partner_group_id = NULL,
-                company_name = '현대해상30일책임보험전산',
-                representative = '전체관리자'
-            WHERE username = 'admin' OR role IS NULL
-        """)
-        
-        # 비밀번호 해시 업데이트 (bcrypt로 #admin1004 해시)
+        # 초기 비밀번호 해시는 쓰기 잠금을 잡기 전에 미리 계산
+        # 관리자가 바로 변경할 수 있는 부트스트랩 값이므로 cost 10을 쓰고 salt 하나를 두 해시에 함께 사용
+        # (두 비밀번호 모두 이 스크립트에 공개된 기본값이라 salt 공유로 드러나는 정보가 없음 - 실제 사용자 비밀번호에는 적용 금지)
         import bcrypt
-        password_hash = bcrypt.hashpw('#admin1004'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        cursor.execute("""
-            UPDATE member 
-            SET password_hash = ?
-            WHERE username = 'hyundai' AND role = 'admin'
-        """, (password_hash,))
-        
-        print("  ✅ 관리자 계정 업데이트 완료 (ID: hyundai, PW: #admin1004)")
+        bootstrap_salt = bcrypt.gensalt(10)
+        passwords = {
+            'admin': bcrypt.hashpw('#admin1004'.encode('utf-8'), bootstrap_salt).decode('utf-8'),
+            'partner_group': bcrypt.hashpw('busan1004'.encode('utf-8'), bootstrap_salt).decode('utf-8'),
+        }
+        
+        # DDL 전에 적용해야 하는 설정 (journal_mode는 트랜잭션 밖에서만 변경 가능)
+        # WAL + synchronous=NORMAL: 커밋 시에만 WAL을 fsync, 마이그레이션 중에도 읽기는 막지 않음
+        # mmap_size: 스키마 재파싱/테이블 스캔 시 페이지를 힙 버퍼로 복사하지 않고 메모리 매핑으로 읽음 (256MB)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-131072")
         
-        # 6. 기존 회원들에게 기본 파트너그룹 생성 및 할당
-        print("🏢 기본 파트너그룹 생성 중...")
+        print("🔄 데이터베이스 스키마 마이그레이션 시작...")
         
-        # 기본 파트너그룹 생성
-        default_group_password = bcrypt.hashpw('busan1004'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        cursor.execute("""
-            INSERT OR IGNORE INTO partner_group 
-            (name, admin_username, admin_password_hash, business_number, representative, phone, address)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            '부산자동차매매사업자조합',
-            'busan_admin',
-            default_group_password,
-            '123-45-67890',
-            '조합장',
-            '051-123-4567',
-            '부산광역시'
-        ))
+        # 트랜잭션 시작 + 남은 단계의 CREATE TABLE을 한 번의 파싱으로 실행
+        # (executescript는 열린 트랜잭션을 먼저 커밋하므로 BEGIN을 스크립트 안에 포함)
+        create_tables_sql = ''.join(ddl for ddl, _ in MIGRATION_STEPS[start_version:] if ddl)
+        cursor.executescript("BEGIN IMMEDIATE;" + create_tables_sql)
+        if create_tables_sql:
+            print("📋 신규 테이블 확인/생성 완료")
         
-        # 기본 파트너그룹 ID 가져오기
-        cursor.execute("SELECT id FROM partner_group WHERE name = '부산자동차매매사업자조합'")
-        default_group_id = cursor.fetchone()[0]
+        # 쓰기 잠금을 잡은 뒤 다시 확인 (동시에 실행된 다른 마이그레이션이 먼저 끝났을 수 있음)
+        current_version = cursor.execute("PRAGMA user_version").fetchone()[0]
         
-        # 기존 회원들을 기본 파트너그룹에 할당
-        cursor.execute("""
-            UPDATE member 
-            SET partner_group_id = ?
-            WHERE role != 'admin' AND partner_group_id IS NULL
-        """, (default_group_id,))
+        # 아직 적용되지 않은 단계만 실행
+        for version, (_ddl, step) in enumerate(MIGRATION_STEPS, start=1):
+            if version > current_version and step is not None:
+                step(cursor, passwords)
         
-        # 기존 보험 신청들을 기본 파트너그룹에 할당
-        cursor.execute("""
-            UPDATE insurance_application 
-            SET partner_group_id = ?
-            WHERE partner_group_id IS NULL
-        """, (default_group_id,))
+        # 전체 단계가 하나의 트랜잭션으로 함께 커밋/롤백되므로 user_version은 마지막에 한 번만 기록
+        if current_version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         
-        print(f"  ✅ 기본 파트너그룹 생성 및 할당 완료 (ID: {default_group_id})")
+        # 스키마/데이터가 바뀌었으므로 쿼리 플래너 통계 갱신
+        cursor.execute("ANALYZE")
         
-        # 변경사항 커밋
-        conn.commit()
+        # 변경사항 커밋 (스키마/데이터 변경 전체를 한 번에 반영)
+        cursor.execute("COMMIT")
         print("✅ 데이터베이스 마이그레이션 완료!")
         
-        # 마이그레이션 결과 확인
-        cursor.execute("SELECT COUNT(*) FROM partner_group")
-        partner_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM member WHERE role = 'admin'")
-        admin_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM member WHERE role != 'admin'")
-        member_count = cursor.fetchone()[0]
+        # 마이그레이션 결과 확인 (member 테이블은 한 번만 스캔)
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM partner_group),
+                   COUNT(CASE WHEN role = 'admin' THEN 1 END),
+                   COUNT(CASE WHEN role != 'admin' THEN 1 END)
+            FROM member
+        """)
+        partner_count, admin_count, member_count = cursor.fetchone()
         
         print(f"""
 📊 마이그레이션 결과:
@@ -288,11 +385,13 @@ def migrate_database():
         
     except Exception as e:
         print(f"❌ 마이그레이션 중 오류 발생: {e}")
-        conn.rollback()
+        if conn is not None and conn.in_transaction:
+            conn.execute("ROLLBACK")
         return False
         
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
 
 if __name__ == "__main__":
     # data 디렉토리 생성
@@ -6,11 +6,12 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import app, db, ensure_initialized, PartnerGroup, Member, InsuranceApplication
+from app import app, db, ensure_initialized, PartnerGroup, Member
+from sqlalchemy import text, delete
 from datetime import datetime, date
-from pytz import timezone
+from zoneinfo import ZoneInfo
 
-KST = timezone('Asia/Seoul')
+KST = ZoneInfo('Asia/Seoul')
 
 def test_database_connection():
     """데이터베이스 연결 테스트"""
@@ -32,10 +33,12 @@ def test_database_connection():
             tables = inspector.get_table_names()
             print(f"   테이블 목록: {tables}")
             
-            # 기존 데이터 확인
-            pg_count = db.session.query(PartnerGroup).count()
-            member_count = db.session.query(Member).count()
-            ins_count = db.session.query(InsuranceApplication).count()
+            # 기존 데이터 확인 (세 테이블 건수를 한 번의 쿼리로 조회)
+            pg_count, member_count, ins_count = db.session.execute(text(
+                "SELECT (SELECT COUNT(*) FROM partner_group), "
+                "(SELECT COUNT(*) FROM member), "
+                "(SELECT COUNT(*) FROM insurance_application)"
+            )).one()
             print(f"   기존 데이터:")
             print(f"     - 파트너그룹: {pg_count}개")
             print(f"     - 회원사: {member_count}개")
@@ -50,10 +53,12 @@ def test_database_connection():
             # 테스트용 파트너그룹 생성 (중복 방지)
             timestamp = datetime.now(KST).strftime('%Y%m%d%H%M%S')
             test_name = f"테스트그룹_{timestamp}"
-            existing = db.session.query(PartnerGroup).filter_by(name=test_name).first()
-            if existing:
-                print(f"   테스트 데이터가 이미 존재합니다. 삭제 중...")
-                db.session.delete(existing)
+            # 조회 후 삭제 대신 DELETE ... WHERE 한 번으로 처리
+            deleted = db.session.execute(
+                delete(PartnerGroup).where(PartnerGroup.name == test_name)
+            ).rowcount
+            if deleted:
+                print("   테스트 데이터가 이미 존재하여 삭제했습니다.")
                 db.session.commit()
             
             # 테스트 파트너그룹 생성
@@ -76,7 +81,11 @@ def test_database_connection():
                 print(f"   ✅ 파트너그룹 저장 성공 (ID: {saved_group.id})")
                 
                 # 테스트 데이터 삭제
-                db.session.delete(saved_group)
+                db.session.execute(
+                    delete(PartnerGroup)
+                    .where(PartnerGroup.id == saved_group.id)
+                    .execution_options(synchronize_session=False)
+                )
                 db.session.commit()
                 print(f"   ✅ 테스트 데이터 삭제 완료")
             else:
@@ -95,24 +104,29 @@ def test_database_connection():
             print(f"   업로드 디렉토리: {UPLOAD_DIR}")
             print(f"   데이터 디렉토리: {DATA_DIR}")
             
-            # 디렉토리 존재 확인
-            if os.path.exists(UPLOAD_DIR):
+            # 디렉토리 존재 확인 (존재 여부와 파일 수를 scandir 한 번으로 확인)
+            try:
+                with os.scandir(UPLOAD_DIR) as entries:
+                    file_count = sum(1 for _ in entries)
                 print(f"   ✅ 업로드 디렉토리 존재")
-                files = os.listdir(UPLOAD_DIR)
-                print(f"   업로드된 파일 수: {len(files)}개")
-            else:
+                print(f"   업로드된 파일 수: {file_count}개")
+            except FileNotFoundError:
                 print(f"   ⚠️  업로드 디렉토리가 없습니다. 생성 중...")
                 os.makedirs(UPLOAD_DIR, exist_ok=True)
                 print(f"   ✅ 업로드 디렉토리 생성 완료")
             
-            if os.path.exists(DATA_DIR):
+            # DB 파일은 stat 한 번으로 존재 여부와 크기를 함께 확인
+            db_file = os.path.join(DATA_DIR, 'busan.db')
+            try:
+                size = os.stat(db_file).st_size
+            except FileNotFoundError:
+                size = None
+            if size is not None:
+                print(f"   ✅ 데이터 디렉토리 존재")
+                print(f"   데이터베이스 파일 크기: {size:,} bytes")
+            elif os.path.isdir(DATA_DIR):
                 print(f"   ✅ 데이터 디렉토리 존재")
-                db_file = os.path.join(DATA_DIR, 'busan.db')
-                if os.path.exists(db_file):
-                    size = os.path.getsize(db_file)
-                    print(f"   데이터베이스 파일 크기: {size:,} bytes")
-                else:
-                    print(f"   ⚠️  데이터베이스 파일이 없습니다")
+                print(f"   ⚠️  데이터베이스 파일이 없습니다")
             else:
                 print(f"   ⚠️  데이터 디렉토리가 없습니다")
         except Exception as e:
@@ -138,6 +152,7 @@ def test_database_connection():
             # 커밋 테스트
             if safe_commit():
                 print(f"   ✅ safe_commit 성공")
+                test_member_id = test_member.id
                 
                 # 롤백 테스트 (잘못된 데이터로)
                 try:
@@ -153,7 +168,11 @@ def test_database_connection():
                     print(f"   ✅ 롤백 작동 확인 (예상된 오류: {type(e).__name__})")
                 
                 # 테스트 데이터 삭제
-                db.session.delete(test_member)
+                db.session.execute(
+                    delete(Member)
+                    .where(Member.id == test_member_id)
+                    .execution_options(synchronize_session=False)
+                )
                 safe_commit()
                 print(f"   ✅ 테스트 데이터 삭제 완료")
             else: